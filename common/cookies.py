@@ -1,15 +1,214 @@
+"""
+Browser cookies for the scrapers and downloaders, extracted once and cached.
+
+rookiepy.edge() opens and decrypts Edge's cookie database on every call,
+which dominated the startup of every script. CookieStore keeps the extracted
+cookies in a cache file encrypted with the user's DPAPI key (the same
+protection Edge uses for its own database) and only goes back to the browser
+when the cache is older than its TTL, does not cover the requested domains,
+or a cached cookie of those domains has expired. Platforms without a cipher
+simply extract every time.
+
+Domains filter up front, with rookiepy's semantics: 'dataexpert.io' matches
+every cookie whose domain contains it. The cookies can be exported as an
+aiohttp CookieJar, a Netscape cookie file (yt-dlp's cookiefile) or the
+Cookie header for one URL.
+
+The source and the cipher are injectable, so tests can use a fake browser:
+    CookieStore(source=lambda domains: [...], cache_path=tmp, protect=..., unprotect=...)
+"""
+import json
+import logging
+import sys
+import time
+from email.utils import formatdate
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Callable, Iterable, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
 from aiohttp import CookieJar
 from yarl import URL
-import rookiepy
 
-def load_edge_cookies() -> CookieJar:
-    """
-    Load Edge cookies via rookiepy and return an aiohttp.CookieJar.
-    """
+CACHE_PATH = Path.home() / ".cache" / "my-automation" / "edge_cookies.bin"
+CACHE_TTL = 6 * 3600
+
+
+class Cookie(NamedTuple):
+    domain: str
+    path: str
+    secure: bool
+    expires: Optional[float]  # unix time, None for session cookies
+    name: str
+    value: str
+
+    def expired(self, now: float) -> bool:
+        return self.expires is not None and 0 < self.expires <= now
+
+    def matches(self, host: str, path: str, secure: bool) -> bool:
+        """RFC 6265 domain/path matching; a leading dot means subdomains too."""
+        domain = self.domain.lower()
+        if domain.startswith("."):
+            if host != domain[1:] and not host.endswith(domain):
+                return False
+        elif host != domain:
+            return False
+        if self.secure and not secure:
+            return False
+        return path == self.path or path.startswith(self.path.rstrip("/") + "/") or self.path == "/"
+
+
+def _wanted(domain: str, domains: Optional[Iterable[str]]) -> bool:
+    return domains is None or any(d in domain for d in domains)
+
+
+def edge_source(domains: Optional[List[str]]) -> List[dict]:
+    import rookiepy  # only needed when the cache misses
+    return rookiepy.edge(domains)
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _Blob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    def _dpapi(data: bytes, protect: bool) -> bytes:
+        buf = ctypes.create_string_buffer(data, len(data))
+        blob_in = _Blob(len(data), ctypes.cast(buf, ctypes.POINTER(ctypes.c_char)))
+        blob_out = _Blob()
+        call = ctypes.windll.crypt32.CryptProtectData if protect else ctypes.windll.crypt32.CryptUnprotectData
+        # CRYPTPROTECT_UI_FORBIDDEN: fail instead of prompting
+        if not call(ctypes.byref(blob_in), None, None, None, None, 0x01, ctypes.byref(blob_out)):
+            raise ctypes.WinError()
+        try:
+            return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+        finally:
+            ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+    def dpapi_protect(data: bytes) -> bytes:
+        return _dpapi(data, True)
+
+    def dpapi_unprotect(data: bytes) -> bytes:
+        return _dpapi(data, False)
+else:
+    dpapi_protect = dpapi_unprotect = None
+
+
+class CookieStore:
+    def __init__(
+        self,
+        source: Callable[[Optional[List[str]]], List[dict]] = edge_source,
+        cache_path: Path = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        protect: Optional[Callable[[bytes], bytes]] = dpapi_protect,
+        unprotect: Optional[Callable[[bytes], bytes]] = dpapi_unprotect,
+    ):
+        self.source = source
+        self.cache_path = Path(cache_path)
+        self.ttl = ttl
+        self.protect = protect
+        self.unprotect = unprotect
+        self.extractions = 0
+
+    def _read_cache(self) -> Optional[dict]:
+        if self.unprotect is None or not self.cache_path.exists():
+            return None
+        try:
+            return json.loads(self.unprotect(self.cache_path.read_bytes()))
+        except (OSError, ValueError) as e:
+            logging.debug("Ignoring unreadable cookie cache %s: %s", self.cache_path, e)
+            return None
+
+    def _write_cache(self, state: dict) -> None:
+        if self.protect is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_bytes(self.protect(json.dumps(state).encode("utf-8")))
+        tmp.replace(self.cache_path)
+
+    def _extract(self, domains: Optional[List[str]]) -> List[Cookie]:
+        self.extractions += 1
+        return [
+            Cookie(c.get("domain", ""), c.get("path") or "/", bool(c.get("secure")),
+                   c.get("expires") or None, c.get("name", ""), c.get("value", ""))
+            for c in self.source(domains)
+        ]
+
+    def cookies(self, domains: Optional[Iterable[str]] = None, refresh: bool = False) -> List[Cookie]:
+        """Unexpired cookies for domains (None: all), from the cache when it is still good."""
+        wanted = sorted(set(domains)) if domains is not None else None
+        extract = wanted
+        now = time.time()
+        state = None if refresh else self._read_cache()
+        if state is not None:
+            cached_domains = state["domains"]
+            covers = cached_domains is None or (wanted is not None and set(wanted) <= set(cached_domains))
+            if covers and now - state["extracted_at"] < self.ttl:
+                cookies = [Cookie(*c) for c in state["cookies"] if _wanted(c[0], wanted)]
+                if not any(c.expired(now) for c in cookies):
+                    return cookies
+            # widen the extraction to everything the cache already held
+            if wanted is not None and cached_domains is not None:
+                extract = sorted(set(wanted) | set(cached_domains))
+            else:
+                extract = None
+        cookies = [c for c in self._extract(extract) if not c.expired(now)]
+        self._write_cache({"domains": extract, "extracted_at": now, "cookies": cookies})
+        return [c for c in cookies if _wanted(c.domain, wanted)]
+
+
+_default_store = CookieStore()
+
+
+def load_cookies(domains: Optional[Iterable[str]] = None, store: Optional[CookieStore] = None) -> List[Cookie]:
+    return (store or _default_store).cookies(domains)
+
+
+def to_cookiejar(cookies: Iterable[Cookie]) -> CookieJar:
     jar = CookieJar()
-    for c in rookiepy.edge():
-        jar.update_cookies(
-            {c['name']: c['value']},
-            response_url=URL.build(scheme='https', host=c['domain'].lstrip('.'))
-        )
+    for c in cookies:
+        morsel = SimpleCookie()
+        morsel[c.name] = c.value
+        m = morsel[c.name]
+        if c.domain.startswith("."):
+            m["domain"] = c.domain
+        m["path"] = c.path
+        if c.secure:
+            m["secure"] = True
+        if c.expires:
+            m["expires"] = formatdate(c.expires, usegmt=True)
+        jar.update_cookies(morsel, response_url=URL.build(scheme="https", host=c.domain.lstrip(".")))
     return jar
+
+
+def write_netscape(cookies: Iterable[Cookie], file_path) -> None:
+    """Write a Netscape cookie file (the format yt-dlp's cookiefile expects)."""
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write("# Netscape HTTP Cookie File\n")
+        for c in cookies:
+            include_subdomains = "TRUE" if c.domain.startswith(".") else "FALSE"
+            secure_flag = "TRUE" if c.secure else "FALSE"
+            f.write(f"{c.domain}\t{include_subdomains}\t{c.path}\t{secure_flag}\t{int(c.expires or 0)}\t"
+                    f"{c.name}\t{c.value}\n")
+
+
+def cookie_header(cookies: Iterable[Cookie], url: str) -> str:
+    """Cookie header for one URL: only the cookies its host and path would receive."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    path = parts.path or "/"
+    now = time.time()
+    return "; ".join(
+        f"{c.name}={c.value}" for c in cookies
+        if not c.expired(now) and c.matches(host, path, parts.scheme == "https")
+    )
+
+
+def load_edge_cookies(domains: Optional[Iterable[str]] = None) -> CookieJar:
+    """
+    Load Edge cookies (cached, see CookieStore) and return an aiohttp.CookieJar.
+    """
+    return to_cookiejar(load_cookies(domains))
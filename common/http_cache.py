@@ -0,0 +1,117 @@
+"""
+On-disk HTTP response cache (SQLite) for the scrapers.
+
+Bodies are stored per URL with their ETag / Last-Modified, so a re-run can
+revalidate with If-None-Match / If-Modified-Since and pay only for a 304.
+Entries younger than the TTL are served without any request, the total size
+is capped with least-recently-used eviction, and offline callers can read
+whatever is stored regardless of age.
+"""
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+)
+"""
+
+
+class CachedResponse(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class ResponseCache:
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.fresh = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)')
+        (self._total,) = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        row = self._conn.execute(
+            'SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        self._conn.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), url))
+        return CachedResponse(*row)
+
+    def is_fresh(self, entry: CachedResponse, offline: bool = False) -> bool:
+        """True when the entry can be used without asking the server: younger than the TTL, or offline."""
+        if offline or time.time() - entry.fetched_at < self.ttl:
+            self.fresh += 1
+            return True
+        return False
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedResponse]) -> Dict[str, str]:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        self.misses += 1
+        now = time.time()
+        size = len(body.encode('utf-8'))
+        old = self._conn.execute('SELECT size FROM responses WHERE url = ?', (url,)).fetchone()
+        self._conn.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, body, etag, last_modified, now, now, size),
+        )
+        self._total += size - (old[0] if old else 0)
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark an entry as just revalidated (the server answered 304)."""
+        self.revalidated += 1
+        now = time.time()
+        self._conn.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?', (now, now, url))
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        doomed = []
+        for url, size in self._conn.execute('SELECT url, size FROM responses ORDER BY accessed_at'):
+            if self._total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            self._total -= size
+        self._conn.executemany('DELETE FROM responses WHERE url = ?', doomed)
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def summary(self) -> str:
+        return f"HTTP cache: {self.fresh} fresh, {self.revalidated} revalidated (304), {self.misses} downloaded"
@@ -0,0 +1,363 @@
+"""
+Benchmark the renamer scans on synthetic corpora, offline, on Linux.
+
+    python benchmark.py                          # 1k/10k/100k, compared with the baseline
+    python benchmark.py --sizes 1000 --save      # store a new baseline
+    python benchmark.py --generate D:/tmp/corpus --sizes 5000
+
+Corpora are minimal but well-formed JPEG/HEIC/PNG/MP4 files (headers only,
+no pixels) with controllable EXIF presence, date spread and collision rate.
+They are generated once per parameter set under CORPUS_ROOT and reused.
+
+Every benchmark runs in a fresh child process, so imports and caches of one
+run never help the next. Reported per run: files/sec, peak RSS and the
+read/write syscall counts from /proc/self/io; with --strace also the total
+syscall count (minus a run that only imports renamer). rename_photos really
+renames and is reverted from its journal afterwards.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+BENCHMARKS = ('get_photo_dates', 'rename_photos', 'check_photos', 'check_videos', 'check_files')
+SIZES_DEFAULT = (1000, 10000, 100000)
+CORPUS_ROOT = os.path.join(tempfile.gettempdir(), 'photo_routine_bench')
+BASELINE_PATH = os.path.join(os.path.expanduser('~'), '.photo_renamer_benchmarks.json')
+# slower (files/sec) or bigger (peak RSS) than the baseline by more than this fails the run
+REGRESSION_THRESHOLD = 0.15
+
+CorpusSpec = namedtuple('CorpusSpec', [
+    'count',
+    'exif_ratio',      # share of files carrying a date in their metadata
+    'collision_rate',  # share of files taken on a few busy days
+    'video_ratio',     # share of MP4 files, the rest are JPEG/HEIC/PNG
+    'start',           # first day, ISO
+    'days',            # dates are spread over this many days
+    'seed',
+])
+
+PHOTO_MIX = (('jpg', 0.5), ('heic', 0.35), ('png', 0.15))
+MP4_EPOCH = date(1904, 1, 1)
+
+
+# --- synthetic files -------------------------------------------------------
+
+def _box(box_type, payload):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def _tiff(date_time):
+    """Little-endian TIFF with IFD0 DateTime (306) and Exif IFD DateTimeOriginal (36867)."""
+    value = date_time.encode('ascii') + b'\x00'
+    exif_ifd = 8 + 2 + 2 * 12 + 4
+    data = exif_ifd + 2 + 12 + 4
+    out = b'II' + struct.pack('<HI', 42, 8)
+    out += struct.pack('<H', 2)
+    out += struct.pack('<HHII', 306, 2, len(value), data)
+    out += struct.pack('<HHII', 34665, 4, 1, exif_ifd)
+    out += struct.pack('<I', 0)
+    out += struct.pack('<H', 1) + struct.pack('<HHII', 36867, 2, len(value), data + len(value)) + struct.pack('<I', 0)
+    return out + value + value
+
+
+def make_jpeg(tiff):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    app1 = b'\xff\xe1' + struct.pack('>H', len(tiff) + 8) + b'Exif\x00\x00' + tiff if tiff else b''
+    return b'\xff\xd8' + app0 + app1 + b'\xff\xda' + b'\x00' * 256 + b'\xff\xd9'
+
+
+def make_png(tiff):
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + b'\x00' * 4
+    exif = chunk(b'eXIf', tiff) if tiff else b''
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', b'\x00' * 13) + exif + chunk(b'IDAT', b'\x00' * 256) + chunk(b'IEND', b'')
+
+
+def make_heic(tiff):
+    ftyp = _box(b'ftyp', b'heic\x00\x00\x00\x00mif1heic')
+    hdlr = _box(b'hdlr', b'\x00' * 8 + b'pict' + b'\x00' * 13)
+    items = [(1, b'hvc1')] + ([(2, b'Exif')] if tiff else [])
+    infes = b''.join(_box(b'infe', b'\x02\x00\x00\x00' + struct.pack('>HH', i, 0) + t + b'\x00') for i, t in items)
+    iinf = _box(b'iinf', b'\x00' * 4 + struct.pack('>H', len(items)) + infes)
+    payloads = [b'\x00' * 256] + ([struct.pack('>I', 6) + b'Exif\x00\x00' + tiff] if tiff else [])
+
+    def meta(mdat_start):
+        body = b'\x01\x00\x00\x00\x44\x40' + struct.pack('>H', len(items))
+        offset = mdat_start
+        for (item_id, _), payload in zip(items, payloads):
+            body += struct.pack('>HHHIH', item_id, 0, 0, 0, 1) + struct.pack('>II', offset, len(payload))
+            offset += len(payload)
+        return _box(b'meta', b'\x00' * 4 + hdlr + iinf + _box(b'iloc', body))
+
+    mdat_start = len(ftyp) + len(meta(0)) + 8
+    return ftyp + meta(mdat_start) + _box(b'mdat', b''.join(payloads))
+
+
+def make_mp4(day, date_time):
+    """MP4 with moov/mvhd creation_time and udta (c)day; no dates when day is None."""
+    seconds = 0
+    udta = b''
+    if day is not None:
+        seconds = (day - MP4_EPOCH).days * 86400 + int(date_time[11:13]) * 3600
+        text = day.isoformat().encode('ascii')
+        udta = _box(b'udta', _box(b'\xa9day', struct.pack('>HH', len(text), 0) + text))
+    mvhd = _box(b'mvhd', b'\x00' * 4 + struct.pack('>II', seconds, seconds) + b'\x00' * 88)
+    # mdat first, like most cameras: the parser has to seek over it
+    return _box(b'ftyp', b'isom\x00\x00\x00\x00') + _box(b'mdat', b'\x00' * 4096) + _box(b'moov', mvhd + udta)
+
+
+def generate_corpus(directory, spec):
+    """Write spec.count synthetic media files named IMG_000001.ext, ... into directory."""
+    rng = random.Random(spec.seed)
+    start = date.fromisoformat(spec.start)
+    busy_days = [start + timedelta(days=rng.randrange(spec.days)) for _ in range(max(1, spec.count // 500))]
+    exts = [ext for ext, _ in PHOTO_MIX]
+    weights = [weight for _, weight in PHOTO_MIX]
+
+    os.makedirs(directory, exist_ok=True)
+    for i in range(1, spec.count + 1):
+        if rng.random() < spec.collision_rate:
+            day = rng.choice(busy_days)
+        else:
+            day = start + timedelta(days=rng.randrange(spec.days))
+        date_time = f'{day:%Y:%m:%d} {rng.randrange(24):02}:{rng.randrange(60):02}:{rng.randrange(60):02}'
+        has_date = rng.random() < spec.exif_ratio
+
+        if rng.random() < spec.video_ratio:
+            ext, data = 'mp4', make_mp4(day if has_date else None, date_time)
+        else:
+            ext = rng.choices(exts, weights)[0]
+            tiff = _tiff(date_time) if has_date else b''
+            data = {'jpg': make_jpeg, 'png': make_png, 'heic': make_heic}[ext](tiff)
+        with open(os.path.join(directory, f'IMG_{i:06d}.{ext}'), 'wb') as f:
+            f.write(data)
+
+
+def corpus_for(spec, root=CORPUS_ROOT):
+    """Return the corpus directory for spec, generating it unless an identical one exists."""
+    name = f'{spec.count}-e{spec.exif_ratio}-c{spec.collision_rate}-v{spec.video_ratio}-s{spec.seed}'
+    directory = os.path.join(root, name)
+    # the marker lives next to the corpus so the scans never see it
+    marker = directory + '.json'
+    if os.path.exists(marker):
+        with open(marker, encoding='utf-8') as f:
+            if json.load(f) == spec._asdict():
+                return directory
+    shutil.rmtree(directory, ignore_errors=True)
+    started = time.perf_counter()
+    generate_corpus(directory, spec)
+    with open(marker, 'w', encoding='utf-8') as f:
+        json.dump(spec._asdict(), f)
+    print(f"Generated {spec.count} files in {directory} ({time.perf_counter() - started:.1f}s)")
+    return directory
+
+
+def discard_corpus(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+    if os.path.exists(directory + '.json'):
+        os.remove(directory + '.json')
+
+
+# --- measuring -------------------------------------------------------------
+
+def _proc_io():
+    with open('/proc/self/io', encoding='ascii') as f:
+        return {key: int(value) for key, value in (line.split(': ') for line in f)}
+
+
+def _run_child(name, directory, result_path):
+    """Child process: run one benchmark and write its measurements to result_path."""
+    import resource
+    import renamer
+    from rename_plan import revert_journal
+
+    workdir = os.path.dirname(result_path)
+    journal_path = os.path.join(workdir, 'journal.jsonl')
+    calls = {
+        'noop': lambda: None,
+        'get_photo_dates': lambda: renamer.get_photo_dates(directory),
+        'rename_photos': lambda: renamer.rename_photos(directory, journal_path=journal_path),
+        'check_photos': lambda: renamer.check_photos(directory),
+        'check_videos': lambda: renamer.check_videos(directory),
+        'check_files': lambda: sum(1 for _ in renamer.check_files(
+            directory, report_path=os.path.join(workdir, 'check_files.csv'))),
+    }
+
+    stdout = sys.stdout
+    # the scans print a line per file; that is not what is being measured
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        io_before = _proc_io()
+        started = time.perf_counter()
+        calls[name]()
+        seconds = time.perf_counter() - started
+        io_after = _proc_io()
+        if name == 'rename_photos' and os.path.exists(journal_path):
+            revert_journal(journal_path)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'seconds': seconds,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'syscr': io_after['syscr'] - io_before['syscr'],
+            'syscw': io_after['syscw'] - io_before['syscw'],
+        }, f)
+
+
+def _strace_calls(path):
+    """Sum the 'calls' column of an strace -c summary."""
+    total = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 5 and parts[0][0].isdigit() and parts[-1] != 'total':
+                total += int(parts[3])
+    return total
+
+
+def run_benchmark(name, directory, strace=False):
+    with tempfile.TemporaryDirectory(prefix='photo_bench_') as workdir:
+        result_path = os.path.join(workdir, 'result.json')
+        command = [sys.executable, os.path.abspath(__file__), '--child', name, directory, result_path]
+        strace_path = os.path.join(workdir, 'strace.txt')
+        if strace:
+            command = ['strace', '-f', '-c', '-o', strace_path] + command
+        # hard-coded Windows report paths of the checks land in workdir
+        completed = subprocess.run(command, cwd=workdir)
+        if completed.returncode != 0:
+            return None
+        with open(result_path, encoding='utf-8') as f:
+            result = json.load(f)
+        if strace:
+            result['syscalls'] = _strace_calls(strace_path)
+    return result
+
+
+def exiftool_available():
+    from exiftool_session import EXIFTOOL_PATH
+    return os.path.isfile(EXIFTOOL_PATH) or shutil.which(EXIFTOOL_PATH) is not None
+
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def regressions(result, base, threshold=REGRESSION_THRESHOLD):
+    """Return human-readable reasons result is worse than base, [] if it is not."""
+    found = []
+    if result['files_per_sec'] < base['files_per_sec'] * (1 - threshold):
+        found.append(f"files/sec {base['files_per_sec']:.0f} -> {result['files_per_sec']:.0f}")
+    if result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold):
+        found.append(f"peak RSS {base['peak_rss_mb']:.0f} -> {result['peak_rss_mb']:.0f} MB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark renamer.py on synthetic photo/video corpora (Linux).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES_DEFAULT), help="Corpus sizes")
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="Run only these benchmarks")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark, the fastest is kept")
+    parser.add_argument("--exif-ratio", type=float, default=0.9)
+    parser.add_argument("--collision-rate", type=float, default=0.3)
+    parser.add_argument("--video-ratio", type=float, default=0.1)
+    parser.add_argument("--start", default='2015-01-01', help="First day of the date spread")
+    parser.add_argument("--days", type=int, default=3650, help="Days the dates are spread over")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--corpus-root", default=CORPUS_ROOT, help="Where corpora are kept (default: %(default)s)")
+    parser.add_argument("--generate", metavar="DIR", help="Only write a corpus of the first size into DIR")
+    parser.add_argument("--strace", action="store_true", help="Also count every syscall with strace -c")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _run_child(*args.child)
+        return
+
+    specs = [
+        CorpusSpec(size, args.exif_ratio, args.collision_rate, args.video_ratio, args.start, args.days, args.seed)
+        for size in args.sizes
+    ]
+    if args.generate:
+        generate_corpus(args.generate, specs[0])
+        print(f"{specs[0].count} files written to {args.generate}")
+        return
+
+    names = args.only or list(BENCHMARKS)
+    if 'check_files' in names and not exiftool_available():
+        print("exiftool not found (set EXIFTOOL_PATH), skipping check_files")
+        names.remove('check_files')
+
+    noop = {}
+    if args.strace:
+        noop = run_benchmark('noop', tempfile.gettempdir(), strace=True) or {}
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    failed = []
+    print(f"{'benchmark':<16} {'files':>7} {'files/s':>9} {'seconds':>8} {'RSS MB':>7} {'syscr':>8} {'syscw':>7}"
+          + (f" {'syscalls':>9}" if args.strace else ''))
+    for spec in specs:
+        directory = corpus_for(spec, args.corpus_root)
+        for name in names:
+            runs = []
+            for _ in range(args.repeat):
+                result = run_benchmark(name, directory, args.strace)
+                if result is None:
+                    # a crashed rename may have left the corpus half renamed
+                    discard_corpus(directory)
+                    break
+                runs.append(result)
+            if not runs:
+                print(f"{name:<16} {spec.count:>7} failed")
+                failed.append(f'{name}@{spec.count}')
+                directory = corpus_for(spec, args.corpus_root)
+                continue
+
+            result = min(runs, key=lambda r: r['seconds'])
+            result['files'] = spec.count
+            result['files_per_sec'] = spec.count / result['seconds'] if result['seconds'] else 0.0
+            if args.strace:
+                result['syscalls'] -= noop.get('syscalls', 0)
+            key = f'{name}@{spec.count}'
+            results[key] = result
+
+            line = (f"{name:<16} {spec.count:>7} {result['files_per_sec']:>9.0f} {result['seconds']:>8.2f}"
+                    f" {result['peak_rss_mb']:>7.0f} {result['syscr']:>8} {result['syscw']:>7}")
+            if args.strace:
+                line += f" {result['syscalls']:>9}"
+            if key in baseline:
+                worse = regressions(result, baseline[key])
+                if worse:
+                    failed.append(key)
+                    line += '  REGRESSION: ' + ', '.join(worse)
+            print(line)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    if failed:
+        print(f"{len(failed)} benchmarks failed or regressed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
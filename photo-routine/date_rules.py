@@ -0,0 +1,123 @@
+"""
+Which metadata date a file is named and checked after, per extension.
+
+DATE_RULES is the single place the priority chains live; they are compiled
+once into per-extension tuples so resolving a date is a few dict lookups.
+Tags are exiftool names; scan_file() maps the dates it reads itself onto the
+same names, so the chains work with and without full metadata.
+"""
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# Tags marked 'utc' are stored in UTC (QuickTime) and are shifted to the
+# local time of the shot (OffsetTimeOriginal, else this machine's timezone)
+# before the day is taken. The first tag holding a valid date wins.
+DATE_RULES = {
+    ('heic', 'jpg', 'jpeg', 'png'): [
+        'DateTimeOriginal',
+        'ModifyDate',
+    ],
+    ('mp4', 'mov'): [
+        'ContentCreateDate',
+        'CreationDate',
+        ('MediaCreateDate', 'utc'),
+        ('CreateDate', 'utc'),
+    ],
+    '*': [
+        'DateTimeOriginal',
+        'CreationDate',
+        ('MediaCreateDate', 'utc'),
+        'FileCreateDate',
+        'DateCreated',
+        'ContentCreateDate',
+    ],
+}
+
+OFFSET_TAGS = ('OffsetTimeOriginal', 'OffsetTime')
+
+
+def compile_rules(rules):
+    """Return ({ext: ((tag, is_utc), ...)}, default chain) for resolve_date()."""
+    chains = {}
+    default = ()
+    for exts, tags in rules.items():
+        chain = tuple(
+            (tag, False) if isinstance(tag, str) else (tag[0], tag[1] == 'utc')
+            for tag in tags
+        )
+        if exts == '*':
+            default = chain
+        else:
+            for ext in ((exts,) if isinstance(exts, str) else exts):
+                chains[ext.lower()] = chain
+    return chains, default
+
+
+_CHAINS, _DEFAULT_CHAIN = compile_rules(DATE_RULES)
+
+
+def plain_date(value):
+    """'2021:02:12 10:00:00' / '2021-02-12T10:00:00+0300' -> '20210212', '' when no date."""
+    if not isinstance(value, str):
+        return ''
+    date_part = value[:10].replace(':', '').replace('-', '')
+    if len(date_part) != 8 or not date_part.isdigit() or date_part.startswith('0000'):
+        return ''
+    return date_part
+
+
+@lru_cache(maxsize=None)
+def _offset(value):
+    """'+03:00' / '-0530' -> tzinfo, None when unparsable."""
+    sign = -1 if value[:1] == '-' else 1
+    digits = value.lstrip('+-').replace(':', '')
+    if len(digits) != 4 or not digits.isdigit():
+        return None
+    return timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+
+
+def utc_date(value, offset=''):
+    """Day of a UTC timestamp in the shot's timezone (offset) or the local one."""
+    date_part = plain_date(value)
+    # a value that carries its own offset is already wall-clock time
+    if not date_part or len(value) < 19 or value[19:20] not in ('', 'Z', 'z'):
+        return date_part
+    try:
+        moment = datetime.strptime(value[:19].replace('-', ':').replace('T', ' '), '%Y:%m:%d %H:%M:%S')
+    except ValueError:
+        return date_part
+    moment = moment.replace(tzinfo=timezone.utc)
+    tz = _offset(offset) if offset else None
+    return (moment.astimezone(tz) if tz else moment.astimezone()).strftime('%Y%m%d')
+
+
+def resolve_date(ext, tags):
+    """Return (YYYYMMDD, tag it came from) following ext's chain, ('', '') if none."""
+    for tag, is_utc in _CHAINS.get(ext, _DEFAULT_CHAIN):
+        value = tags.get(tag)
+        if not value:
+            continue
+        if is_utc:
+            offset = next((tags[t] for t in OFFSET_TAGS if tags.get(t)), '')
+            date_part = utc_date(value, offset)
+        else:
+            date_part = plain_date(value)
+        if date_part:
+            return date_part, tag
+    return '', ''
+
+
+_is_date_tag = {}
+
+
+def possible_dates(tags):
+    """Sorted distinct days found in any *Date* tag."""
+    found = set()
+    for tag, value in tags.items():
+        is_date = _is_date_tag.get(tag)
+        if is_date is None:
+            # the same few hundred tag names repeat across every file
+            is_date = _is_date_tag[tag] = 'date' in tag.lower()
+        if is_date:
+            found.add(str(value)[:10].replace(':', ''))
+    return sorted(found)
@@ -0,0 +1,149 @@
+"""
+Find byte-identical copies in the photo archive (the _1, _2 leftovers of
+earlier rename runs) without hashing every byte:
+
+    1. group files by size (free, sizes come from the directory walk)
+    2. inside same-size groups, hash the first and last 64 KB
+    3. fully hash (mmap) only files whose partial hashes still collide
+
+Duplicate sets are written to a ';'-separated CSV; extras can optionally be
+replaced with hard links to the kept copy or removed.
+"""
+import argparse
+import csv
+import hashlib
+import mmap
+import os
+import re
+from collections import defaultdict
+
+from walker import walk_files
+
+PARTIAL_SIZE = 64 * 1024
+REPORT_DEFAULT = r'C:\Users\crisc\OneDrive\Desktop\duplicates.csv'
+
+_SUFFIX_RE = re.compile(r'_\d+$')
+
+
+def partial_hash(file_path, size):
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        h.update(f.read(PARTIAL_SIZE))
+        if size > 2 * PARTIAL_SIZE:
+            f.seek(-PARTIAL_SIZE, os.SEEK_END)
+            h.update(f.read(PARTIAL_SIZE))
+        elif size > PARTIAL_SIZE:
+            h.update(f.read())
+    return h.digest()
+
+
+def full_hash(file_path):
+    h = hashlib.blake2b(digest_size=32)
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        h.update(m)
+    return h.digest()
+
+
+def _group(paths, key):
+    groups = defaultdict(list)
+    for file_path in paths:
+        try:
+            groups[key(file_path)].append(file_path)
+        except OSError as e:
+            print(f"Error {file_path}: {e}")
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(files):
+    """
+    files: iterable of (file_path, stat) as yielded by walk_files().
+    Return a list of (size, [paths]) sets of identical files, biggest first.
+    """
+    by_size = defaultdict(list)
+    seen_inodes = set()
+    for file_path, stat in files:
+        if stat.st_size == 0:
+            continue
+        # hard links to one file are not duplicates (st_ino is 0 when unknown)
+        if stat.st_ino:
+            inode = (stat.st_dev, stat.st_ino)
+            if inode in seen_inodes:
+                continue
+            seen_inodes.add(inode)
+        by_size[stat.st_size].append(file_path)
+
+    duplicates = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        for group in _group(paths, lambda p: partial_hash(p, size)):
+            # the partial hash already covered the whole file
+            if size <= 2 * PARTIAL_SIZE:
+                duplicates.append((size, group))
+            else:
+                duplicates.extend((size, g) for g in _group(group, full_hash))
+
+    duplicates.sort(key=lambda d: d[0] * len(d[1]), reverse=True)
+    return duplicates
+
+
+def keeper_order(file_path):
+    """Prefer the copy without a _N suffix, then the shortest name."""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return bool(_SUFFIX_RE.search(stem)), len(stem), file_path
+
+
+def write_report(duplicates, report_path):
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['set', 'size', 'keep', 'path'])
+        for i, (size, paths) in enumerate(duplicates, 1):
+            keep, *extras = sorted(paths, key=keeper_order)
+            writer.writerow([i, size, 'yes', keep])
+            for file_path in extras:
+                writer.writerow([i, size, 'no', file_path])
+
+
+def resolve(duplicates, action, dry_run=False):
+    """Hard-link ('link') or delete ('remove') every copy but the kept one."""
+    freed = 0
+    for size, paths in duplicates:
+        keep, *extras = sorted(paths, key=keeper_order)
+        for file_path in extras:
+            if dry_run:
+                print(f"Would {action}: {file_path} (keeping {keep})")
+            elif action == 'link':
+                temp_path = file_path + '.dedupe-link'
+                os.link(keep, temp_path)
+                os.replace(temp_path, file_path)
+                print(f"Linked: {file_path} -> {keep}")
+            else:
+                os.remove(file_path)
+                print(f"Removed: {file_path} (kept {keep})")
+            freed += size
+    return freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find byte-identical duplicates in a photo archive.")
+    parser.add_argument("directory", help="Archive root (scanned recursively)")
+    parser.add_argument("--report", default=REPORT_DEFAULT, help="CSV of duplicate sets (default: %(default)s)")
+    parser.add_argument("--action", choices=['report', 'link', 'remove'], default='report')
+    parser.add_argument("--dry-run", action="store_true", help="Only print what link/remove would do")
+    parser.add_argument("--exclude", action="append", help="Glob of files/folders to skip (repeatable)")
+    parser.add_argument("--ext", action="append", help="Only consider these extensions")
+    args = parser.parse_args()
+
+    files = walk_files(args.directory, recursive=True, exclude=args.exclude, extensions=args.ext)
+    duplicates = find_duplicates(files)
+    write_report(duplicates, args.report)
+    wasted = sum(size * (len(paths) - 1) for size, paths in duplicates)
+    print(f"{len(duplicates)} duplicate sets, {wasted / 1024 ** 2:.1f} MB in extra copies, report: {args.report}")
+
+    if args.action != 'report':
+        freed = resolve(duplicates, args.action, args.dry_run)
+        print(f"{freed / 1024 ** 2:.1f} MB {'would be ' if args.dry_run else ''}freed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Read EXIF DateTimeOriginal (36867) and DateTime (306) straight from the file
+header, without decoding the image through Pillow / pillow_heif.
+
+Supported containers:
+    JPEG  - APP1 "Exif" segment, markers are skipped with seek()
+    HEIC  - "Exif" item found via meta/iinf + meta/iloc
+    PNG   - eXIf chunk
+
+read_exif_dates() returns (date_time_original, date_time) as raw EXIF strings
+('' when the tag is absent) or None when the file could not be parsed, in
+which case the caller should fall back to Pillow. read_exif_thumbnail()
+returns the JPEG thumbnail stored in IFD1, if any.
+"""
+import os
+import struct
+
+TAG_ORIENTATION = 274
+TAG_DATE_TIME = 306
+TAG_THUMBNAIL_OFFSET = 513
+TAG_THUMBNAIL_LENGTH = 514
+TAG_EXIF_IFD = 34665
+TAG_DATE_TIME_ORIGINAL = 36867
+
+# EXIF blocks are tiny, anything above this is not worth parsing by hand
+MAX_EXIF_SIZE = 1024 * 1024
+MAX_META_BOX_SIZE = 4 * 1024 * 1024
+
+
+def _ascii(data):
+    return data.split(b'\x00', 1)[0].decode('ascii', errors='replace').strip()
+
+
+def _read_ifd(tiff, offset, endian, wanted):
+    """Return {tag: raw value bytes or int} for the wanted tags of one IFD."""
+    found = {}
+    (count,) = struct.unpack_from(endian + 'H', tiff, offset)
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        tag, typ, n = struct.unpack_from(endian + 'HHI', tiff, entry)
+        if tag not in wanted:
+            continue
+        if typ == 2:  # ASCII
+            if n <= 4:
+                found[tag] = tiff[entry + 8:entry + 8 + n]
+            else:
+                (value_offset,) = struct.unpack_from(endian + 'I', tiff, entry + 8)
+                found[tag] = tiff[value_offset:value_offset + n]
+        elif typ == 3:  # SHORT
+            (found[tag],) = struct.unpack_from(endian + 'H', tiff, entry + 8)
+        elif typ in (4, 13):  # LONG / IFD pointer
+            (found[tag],) = struct.unpack_from(endian + 'I', tiff, entry + 8)
+    return found
+
+
+def parse_tiff_dates(tiff):
+    """Return (date_time_original, date_time) from a TIFF/EXIF blob."""
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        raise ValueError("Not a TIFF header")
+    magic, ifd0 = struct.unpack_from(endian + 'HI', tiff, 2)
+    if magic != 42:
+        raise ValueError("Bad TIFF magic")
+
+    ifd = _read_ifd(tiff, ifd0, endian, (TAG_DATE_TIME, TAG_EXIF_IFD))
+    date_time = _ascii(ifd[TAG_DATE_TIME]) if TAG_DATE_TIME in ifd else ''
+    date_time_original = ''
+    if TAG_EXIF_IFD in ifd:
+        exif_ifd = _read_ifd(tiff, ifd[TAG_EXIF_IFD], endian, (TAG_DATE_TIME_ORIGINAL,))
+        if TAG_DATE_TIME_ORIGINAL in exif_ifd:
+            date_time_original = _ascii(exif_ifd[TAG_DATE_TIME_ORIGINAL])
+    return date_time_original, date_time
+
+
+def _jpeg_exif(f):
+    if f.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        while marker[1] == 0xFF:  # fill bytes
+            marker = marker[1:] + f.read(1)
+        code = marker[1]
+        if code in (0xD9, 0xDA):  # EOI / start of scan: no EXIF before image data
+            return b''
+        if code == 0x01 or 0xD0 <= code <= 0xD7:
+            continue
+        (length,) = struct.unpack('>H', f.read(2))
+        if code == 0xE1 and length >= 8:
+            header = f.read(6)
+            if header == b'Exif\x00\x00':
+                return f.read(length - 8)
+            f.seek(length - 8, os.SEEK_CUR)
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def _png_exif(f):
+    if f.read(8) != b'\x89PNG\r\n\x1a\n':
+        return None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return b''
+        length, chunk_type = struct.unpack('>I4s', header)
+        if chunk_type == b'eXIf':
+            return f.read(length) if length <= MAX_EXIF_SIZE else None
+        if chunk_type == b'IEND':
+            return b''
+        f.seek(length + 4, os.SEEK_CUR)  # data + CRC
+
+
+def _iter_boxes(data, start=0, end=None):
+    """Yield (type, payload_start, box_end) for ISOBMFF boxes in data[start:end]."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from('>Q', data, pos + 8)
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield box_type, pos + header, pos + size
+        pos += size
+
+
+def _read_uint(data, pos, size):
+    if size == 0:
+        return 0, pos
+    fmt = {2: '>H', 4: '>I', 8: '>Q'}[size]
+    return struct.unpack_from(fmt, data, pos)[0], pos + size
+
+
+def _heic_exif_item_id(meta, start, end):
+    for box_type, payload, box_end in _iter_boxes(meta, start, end):
+        if box_type != b'iinf':
+            continue
+        version = meta[payload]
+        pos = payload + 4 + (2 if version == 0 else 4)
+        for infe_type, infe, _ in _iter_boxes(meta, pos, box_end):
+            if infe_type != b'infe' or meta[infe] < 2:
+                continue
+            if meta[infe] == 2:
+                (item_id,) = struct.unpack_from('>H', meta, infe + 4)
+                item_type = meta[infe + 8:infe + 12]
+            else:
+                (item_id,) = struct.unpack_from('>I', meta, infe + 4)
+                item_type = meta[infe + 10:infe + 14]
+            if item_type == b'Exif':
+                return item_id
+    return None
+
+
+def _heic_item_extents(meta, start, end, wanted_id):
+    for box_type, payload, _ in _iter_boxes(meta, start, end):
+        if box_type != b'iloc':
+            continue
+        version = meta[payload]
+        pos = payload + 4
+        offset_size, length_size = meta[pos] >> 4, meta[pos] & 0x0F
+        base_offset_size = meta[pos + 1] >> 4
+        index_size = meta[pos + 1] & 0x0F if version in (1, 2) else 0
+        pos += 2
+        item_count, pos = _read_uint(meta, pos, 2 if version < 2 else 4)
+        for _ in range(item_count):
+            item_id, pos = _read_uint(meta, pos, 2 if version < 2 else 4)
+            construction_method = 0
+            if version in (1, 2):
+                construction_method = meta[pos + 1] & 0x0F
+                pos += 2
+            pos += 2  # data_reference_index
+            base_offset, pos = _read_uint(meta, pos, base_offset_size)
+            extent_count, pos = _read_uint(meta, pos, 2)
+            extents = []
+            for _ in range(extent_count):
+                _, pos = _read_uint(meta, pos, index_size)
+                extent_offset, pos = _read_uint(meta, pos, offset_size)
+                extent_length, pos = _read_uint(meta, pos, length_size)
+                extents.append((base_offset + extent_offset, extent_length))
+            if item_id == wanted_id:
+                # only plain file offsets are handled here, idat items go to Pillow
+                return extents if construction_method == 0 else None
+    return None
+
+
+def _heic_exif(f):
+    # walk top-level boxes until "meta", skipping everything else (mdat included)
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack('>Q', f.read(8))
+            header_size = 16
+        if box_type == b'meta':
+            break
+        if size == 0:
+            return None
+        f.seek(size - header_size, os.SEEK_CUR)
+
+    if size - header_size > MAX_META_BOX_SIZE:
+        return None
+    meta = f.read(size - header_size)
+    children = 4  # meta is a FullBox
+    item_id = _heic_exif_item_id(meta, children, len(meta))
+    if item_id is None:
+        return b''
+    extents = _heic_item_extents(meta, children, len(meta), item_id)
+    if not extents or sum(length for _, length in extents) > MAX_EXIF_SIZE:
+        return None
+
+    data = b''
+    for offset, length in extents:
+        f.seek(offset)
+        data += f.read(length)
+    # Exif item payload starts with the offset of the TIFF header
+    (tiff_offset,) = struct.unpack_from('>I', data, 0)
+    return data[4 + tiff_offset:]
+
+
+def read_exif_block(file_path):
+    """
+    Return the raw TIFF/EXIF blob of a JPEG/HEIC/PNG file, b'' when the file
+    has none, or None when the header cannot be parsed.
+    """
+    file_ext = os.path.splitext(file_path)[1][1:].lower()
+    try:
+        with open(file_path, 'rb') as f:
+            if file_ext in ('jpg', 'jpeg'):
+                return _jpeg_exif(f)
+            elif file_ext == 'png':
+                return _png_exif(f)
+            elif file_ext in ('heic', 'heif'):
+                return _heic_exif(f)
+    except (OSError, ValueError, KeyError, IndexError, struct.error):
+        return None
+    return None
+
+
+def read_exif_dates(file_path):
+    """
+    Return (date_time_original, date_time) for a JPEG/HEIC/PNG file, reading
+    only the EXIF block. Returns None when the header cannot be parsed.
+    """
+    tiff = read_exif_block(file_path)
+    if tiff is None:
+        return None
+    if not tiff:
+        return '', ''
+    try:
+        return parse_tiff_dates(tiff)
+    except (ValueError, KeyError, IndexError, struct.error):
+        return None
+
+
+def read_exif_thumbnail(file_path):
+    """
+    Return (jpeg_bytes, orientation) of the thumbnail embedded in IFD1, or
+    None when the file has no EXIF thumbnail.
+    """
+    tiff = read_exif_block(file_path)
+    if not tiff:
+        return None
+    try:
+        endian = '<' if tiff[:2] == b'II' else '>'
+        (ifd0,) = struct.unpack_from(endian + 'I', tiff, 4)
+        orientation = _read_ifd(tiff, ifd0, endian, (TAG_ORIENTATION,)).get(TAG_ORIENTATION, 1)
+        (count,) = struct.unpack_from(endian + 'H', tiff, ifd0)
+        (ifd1,) = struct.unpack_from(endian + 'I', tiff, ifd0 + 2 + count * 12)
+        if not ifd1:
+            return None
+        ifd = _read_ifd(tiff, ifd1, endian, (TAG_THUMBNAIL_OFFSET, TAG_THUMBNAIL_LENGTH))
+        offset, length = ifd.get(TAG_THUMBNAIL_OFFSET), ifd.get(TAG_THUMBNAIL_LENGTH)
+        if not offset or not length or offset + length > len(tiff):
+            return None
+        return tiff[offset:offset + length], orientation
+    except (ValueError, KeyError, IndexError, struct.error):
+        return None
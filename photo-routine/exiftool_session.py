@@ -0,0 +1,115 @@
+"""
+Long-lived exiftool process (-stay_open True -@ -) shared by every metadata
+call, so Perl starts once per run instead of once per file.
+
+The executable defaults to the local Windows install and can be overridden
+with the EXIFTOOL_PATH environment variable (e.g. a stub script on Linux).
+"""
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+
+EXIFTOOL_PATH = os.environ.get('EXIFTOOL_PATH', r'C:\Users\crisc\Downloads\exiftool-13.18_64\exiftool.exe')
+BATCH_SIZE = 64
+
+
+def _key(file_path):
+    # exiftool reports SourceFile with forward slashes, even on Windows
+    return os.path.normcase(os.path.normpath(file_path))
+
+
+class ExifToolSession:
+    def __init__(self, executable=EXIFTOOL_PATH, args=('-j',)):
+        self.executable = executable
+        self.args = list(args)
+        self._process = None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._process is not None and self._process.poll() is None:
+            return
+        self._process = subprocess.Popen(
+            [self.executable, '-stay_open', 'True', '-@', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+        )
+        threading.Thread(target=self._drain_stderr, args=(self._process.stderr,), daemon=True).start()
+
+    @staticmethod
+    def _drain_stderr(stream):
+        for line in stream:
+            print(line.rstrip(), file=sys.stderr)
+
+    def close(self):
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.write('-stay_open\nFalse\n')
+            self._process.stdin.flush()
+            self._process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self._process.kill()
+        self._process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, *args):
+        """Send one command and return its raw stdout, read up to the {ready} marker."""
+        with self._lock:
+            self.start()
+            self._counter += 1
+            ready = f'{{ready{self._counter}}}'
+            command = '\n'.join([*args, '-charset', 'filename=utf8', f'-execute{self._counter}']) + '\n'
+            self._process.stdin.write(command)
+            self._process.stdin.flush()
+
+            lines = []
+            for line in self._process.stdout:
+                if line.rstrip() == ready:
+                    return ''.join(lines)
+                lines.append(line)
+            self._process = None
+            raise RuntimeError("exiftool exited unexpectedly")
+
+    def get_metadata_batch(self, file_paths):
+        """Return {file_path: metadata dict} for the files exiftool could read."""
+        result = {}
+        for i in range(0, len(file_paths), BATCH_SIZE):
+            batch = file_paths[i:i + BATCH_SIZE]
+            output = self.execute(*self.args, *batch)
+            if not output.strip():
+                continue
+            by_key = {_key(path): path for path in batch}
+            for metadata in json.loads(output):
+                file_path = by_key.get(_key(metadata.get('SourceFile', '')))
+                if file_path is not None:
+                    result[file_path] = metadata
+        return result
+
+    def get_metadata(self, file_path):
+        return self.get_metadata_batch([file_path]).get(file_path)
+
+
+_session = None
+
+
+def get_session():
+    """Return the process-wide session, starting exiftool on first use."""
+    global _session
+    if _session is None:
+        _session = ExifToolSession()
+        atexit.register(_session.close)
+    return _session
@@ -0,0 +1,107 @@
+"""
+Persistent per-file metadata cache for the renamer scans.
+
+Rows are keyed by path and are only trusted while the file's size and mtime
+match, so a weekly re-scan of an unchanged archive only reads new or
+modified files. Rows for files that disappeared are evicted after the scan.
+"""
+import json
+import os
+import sqlite3
+
+CACHE_PATH = os.environ.get(
+    'RENAMER_CACHE_PATH',
+    os.path.join(os.path.expanduser('~'), '.photo_renamer_cache.sqlite'),
+)
+
+# bump when the columns change: an older cache is simply rebuilt
+SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    ext TEXT NOT NULL,
+    created_dt TEXT NOT NULL,
+    date_time_original TEXT NOT NULL,
+    date_time TEXT NOT NULL,
+    mp4_day TEXT NOT NULL,
+    creation_date TEXT NOT NULL,
+    movie_create_date TEXT NOT NULL,
+    metadata TEXT
+)
+"""
+
+
+class MetadataCache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            self._conn.execute('DROP TABLE IF EXISTS files')
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self._conn.execute(_SCHEMA)
+
+    def is_fresh(self, file_path, stat, full_metadata=False):
+        """
+        True when the cached row still matches the file's size and mtime and
+        holds the exiftool JSON a full_metadata scan needs.
+        """
+        row = self._conn.execute(
+            'SELECT size, mtime_ns, metadata IS NULL FROM files WHERE path = ?',
+            (file_path,),
+        ).fetchone()
+        if row is None or row[0] != stat.st_size or row[1] != stat.st_mtime_ns or (full_metadata and row[2]):
+            self.misses += 1
+            return False
+        self.hits += 1
+        return True
+
+    def load(self, file_path):
+        """Return the cached FileRecord fields after path of a fresh row."""
+        row = self._conn.execute(
+            'SELECT ext, created_dt, date_time_original, date_time, mp4_day, creation_date, movie_create_date,'
+            ' metadata FROM files WHERE path = ?',
+            (file_path,),
+        ).fetchone()
+        metadata = json.loads(row[7]) if row[7] is not None else None
+        return (*row[:7], metadata)
+
+    def put(self, record, stat):
+        metadata = json.dumps(record.metadata, ensure_ascii=False) if record.metadata is not None else None
+        self._conn.execute(
+            'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                record.path, stat.st_size, stat.st_mtime_ns, record.ext, record.created_dt,
+                str(record.date_time_original), str(record.date_time), str(record.mp4_day),
+                str(record.creation_date), str(record.movie_create_date), metadata,
+            ),
+        )
+
+    def evict_missing(self, directory, seen_paths):
+        """Drop rows under directory that were not seen in this scan and no longer exist."""
+        prefix = os.path.join(directory, '')
+        rows = self._conn.execute(
+            'SELECT path FROM files WHERE path >= ? AND path < ?',
+            (prefix, prefix + '\uffff'),
+        ).fetchall()
+        gone = [(path,) for (path,) in rows if path not in seen_paths and not os.path.exists(path)]
+        self._conn.executemany('DELETE FROM files WHERE path = ?', gone)
+        self.evicted += len(gone)
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"Cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), {self.evicted} evicted"
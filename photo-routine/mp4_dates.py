@@ -0,0 +1,150 @@
+"""
+Read the creation dates of MP4/MOV files by walking the atom tree with
+seek(), instead of building a mutagen MP4 object that parses every tag.
+
+Only these atoms are read; mdat and the trak sample tables are skipped:
+    moov/mvhd                 creation_time (UTC)         -> CreateDate
+    moov/udta/(c)day          QuickTime user data text    -> ContentCreateDate
+    moov[/udta]/meta/ilst     iTunes (c)day item          -> ContentCreateDate
+    moov/meta/keys + ilst     com.apple.quicktime.creationdate -> CreationDate
+
+Tag names follow exiftool so the dates plug into date_rules.DATE_RULES.
+read_mp4_dates() returns None when the file cannot be parsed, in which case
+the caller should fall back to mutagen.
+"""
+import os
+import struct
+from datetime import datetime, timedelta
+
+from exif_dates import MAX_META_BOX_SIZE, _iter_boxes
+
+MP4_EPOCH = datetime(1904, 1, 1)
+DAY_ATOM = b'\xa9day'
+KEY_TAGS = {
+    'com.apple.quicktime.creationdate': 'CreationDate',
+}
+
+
+def _iter_file_boxes(f, start, end):
+    """Like _iter_boxes() but on an open file: only headers are read, payloads are seeked over."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return
+            (size,) = struct.unpack('>Q', large)
+            header_size = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_size:
+            return
+        yield box_type, pos + header_size, pos + size
+        pos += size
+
+
+def _mvhd_create_date(data):
+    version = data[0]
+    if version == 1:
+        (seconds,) = struct.unpack_from('>Q', data, 4)
+    else:
+        (seconds,) = struct.unpack_from('>I', data, 4)
+    if not seconds:
+        return ''
+    return (MP4_EPOCH + timedelta(seconds=seconds)).strftime('%Y:%m:%d %H:%M:%S')
+
+
+def _data_value(data, start, end):
+    """Text of the first 'data' atom inside an ilst item."""
+    for box_type, payload, box_end in _iter_boxes(data, start, end):
+        if box_type == b'data':
+            # 4 bytes type indicator, 4 bytes locale
+            return data[payload + 8:box_end].decode('utf-8', errors='replace').strip('\x00 ')
+    return ''
+
+
+def _parse_meta(data, start, end, dates):
+    # ISO meta is a FullBox, Apple's QuickTime meta is not: a plain box starts with its hdlr size
+    if data[start:start + 4] == b'\x00\x00\x00\x00':
+        start += 4
+    keys = []
+    items = []
+    for box_type, payload, box_end in _iter_boxes(data, start, end):
+        if box_type == b'keys':
+            (count,) = struct.unpack_from('>I', data, payload + 4)
+            pos = payload + 8
+            for _ in range(count):
+                (size,) = struct.unpack_from('>I', data, pos)
+                if size < 8:
+                    break
+                keys.append(data[pos + 8:pos + size].decode('utf-8', errors='replace'))
+                pos += size
+        elif box_type == b'ilst':
+            items.extend(_iter_boxes(data, payload, box_end))
+
+    for item_type, payload, box_end in items:
+        if item_type == DAY_ATOM:
+            tag = 'ContentCreateDate'
+        else:
+            # mdta items are typed by their 1-based index into keys
+            (index,) = struct.unpack('>I', item_type)
+            tag = KEY_TAGS.get(keys[index - 1]) if 0 < index <= len(keys) else None
+        if tag and not dates.get(tag):
+            dates[tag] = _data_value(data, payload, box_end)
+
+
+def _parse_udta(data, dates):
+    for box_type, payload, box_end in _iter_boxes(data):
+        if box_type == DAY_ATOM:
+            if data[payload + 4:payload + 8] == b'data':
+                value = _data_value(data, payload, box_end)
+            else:
+                # QuickTime text: 2 bytes length, 2 bytes language, text
+                (length,) = struct.unpack_from('>H', data, payload)
+                value = data[payload + 4:payload + 4 + length].decode('utf-8', errors='replace')
+            dates.setdefault('ContentCreateDate', value.strip('\x00 '))
+        elif box_type == b'meta':
+            _parse_meta(data, payload, box_end, dates)
+
+
+def _moov_dates(f):
+    file_end = os.fstat(f.fileno()).st_size
+    # top level: ftyp, mdat (often GBs), moov, ... in any order
+    for box_type, start, end in _iter_file_boxes(f, 0, file_end):
+        if box_type == b'moov':
+            break
+    else:
+        return None
+
+    dates = {}
+    for box_type, payload, box_end in _iter_file_boxes(f, start, end):
+        if box_type == b'mvhd':
+            f.seek(payload)
+            dates['CreateDate'] = _mvhd_create_date(f.read(16))
+        elif box_type in (b'udta', b'meta') and box_end - payload <= MAX_META_BOX_SIZE:
+            f.seek(payload)
+            data = f.read(box_end - payload)
+            if box_type == b'udta':
+                _parse_udta(data, dates)
+            else:
+                _parse_meta(data, 0, len(data), dates)
+    return dates
+
+
+def read_mp4_dates(file_path):
+    """
+    Return {exiftool tag: raw date} (CreateDate, ContentCreateDate,
+    CreationDate; absent tags are left out) or None when the atoms cannot be
+    parsed.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            return _moov_dates(f)
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
@@ -0,0 +1,213 @@
+"""
+Find near-duplicate photos: the same shot kept as HEIC and as a JPEG export,
+or re-saved at another size, which byte-level dedupe cannot see.
+
+Every image gets a 64-bit difference hash (dHash) computed from a
+thumbnail-sized decode: the EXIF thumbnail when the file has one, a DCT-scaled
+JPEG draft or the HEIF thumbnail item otherwise. Hashes go into a multi-index
+hash table, so each lookup only compares against a handful of candidates
+instead of every other image, and matches are grouped with union-find.
+"""
+import argparse
+import csv
+import io
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from PIL import Image, ImageOps
+from pillow_heif import register_heif_opener
+
+from exif_dates import read_exif_thumbnail
+from walker import walk_files
+
+try:
+    from pillow_heif import thumbnail as heif_thumbnail
+except ImportError:  # older pillow_heif: decode the primary image instead
+    heif_thumbnail = None
+
+register_heif_opener()
+
+IMAGE_EXTENSIONS = ('heic', 'jpg', 'jpeg', 'png')
+MAX_DISTANCE_DEFAULT = 6
+REPORT_DEFAULT = r'C:\Users\crisc\OneDrive\Desktop\near_duplicates.csv'
+
+_ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+
+def dhash(image, size=8):
+    """Return a size*size bit difference hash of a PIL image."""
+    pixels = list(image.convert('L').resize((size + 1, size), Image.Resampling.BILINEAR).getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            bits = (bits << 1) | (left < pixels[row * (size + 1) + col + 1])
+    return bits
+
+
+def _open_small(file_path):
+    embedded = read_exif_thumbnail(file_path)
+    if embedded:
+        data, orientation = embedded
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        if orientation in _ORIENTATION_TRANSPOSE:
+            image = image.transpose(_ORIENTATION_TRANSPOSE[orientation])
+        return image
+
+    image = Image.open(file_path)
+    if image.format == 'JPEG':
+        # let libjpeg decode at 1/8 scale instead of full resolution
+        image.draft('L', (64, 64))
+    elif heif_thumbnail is not None and file_path.lower().endswith(('.heic', '.heif')):
+        image = heif_thumbnail(image, 64)
+    return ImageOps.exif_transpose(image)
+
+
+def image_hash(file_path):
+    """Return (file_path, dhash) or (file_path, None) when the image cannot be read."""
+    try:
+        with _open_small(file_path) as image:
+            return file_path, dhash(image)
+    except Exception as e:
+        print(f"Error {file_path}: {e}")
+        return file_path, None
+
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+
+class MultiIndexHash:
+    """
+    Multi-index hashing over 64-bit hashes: each hash is split into four
+    16-bit chunks with one lookup table per chunk. If two hashes differ in at
+    most r bits, one of their chunks differs in at most r // 4 bits, so a
+    query only probes the few buckets within that radius of each chunk.
+    """
+    CHUNKS = 4
+    CHUNK_BITS = 16
+
+    def __init__(self, max_distance):
+        self.max_distance = max_distance
+        radius = max_distance // self.CHUNKS
+        self._probes = [
+            sum(1 << b for b in bits)
+            for r in range(radius + 1)
+            for bits in combinations(range(self.CHUNK_BITS), r)
+        ]
+        self._tables = [defaultdict(list) for _ in range(self.CHUNKS)]
+        self._entries = []
+
+    def _chunks(self, value):
+        mask = (1 << self.CHUNK_BITS) - 1
+        return [(value >> (c * self.CHUNK_BITS)) & mask for c in range(self.CHUNKS)]
+
+    def add(self, value, item):
+        index = len(self._entries)
+        self._entries.append((value, item))
+        for table, chunk in zip(self._tables, self._chunks(value)):
+            table[chunk].append(index)
+
+    def search(self, value):
+        """Return [(distance, item)] for every item within max_distance."""
+        candidates = set()
+        for table, chunk in zip(self._tables, self._chunks(value)):
+            for probe in self._probes:
+                bucket = table.get(chunk ^ probe)
+                if bucket:
+                    candidates.update(bucket)
+        found = []
+        for index in candidates:
+            other, item = self._entries[index]
+            d = hamming(value, other)
+            if d <= self.max_distance:
+                found.append((d, item))
+        return found
+
+
+def find_near_duplicates(file_paths, max_distance=MAX_DISTANCE_DEFAULT, workers=1):
+    """
+    Return groups of similar images, most similar first, as
+    (score, [(file_path, distance_to_first)]) with score in 0..1.
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            hashes = list(pool.map(image_hash, file_paths, chunksize=64))
+    else:
+        hashes = [image_hash(file_path) for file_path in file_paths]
+    hashes = [(file_path, h) for file_path, h in hashes if h is not None]
+
+    index = MultiIndexHash(max_distance)
+    parent = list(range(len(hashes)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # query before insert: each pair is found exactly once
+    for i, (_, h) in enumerate(hashes):
+        for _, j in index.search(h):
+            a, b = find(i), find(j)
+            if a != b:
+                parent[a] = b
+        index.add(h, i)
+
+    members = defaultdict(list)
+    for i in range(len(hashes)):
+        members[find(i)].append(i)
+
+    groups = []
+    for root, indexes in members.items():
+        if len(indexes) < 2:
+            continue
+        first = hashes[indexes[0]][1]
+        rows = [(hashes[i][0], hamming(first, hashes[i][1])) for i in indexes]
+        score = 1 - max(d for _, d in rows) / 64
+        groups.append((score, rows))
+    groups.sort(key=lambda g: (-g[0], g[1][0][0]))
+    return groups
+
+
+def write_report(groups, report_path):
+    with open(report_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['set', 'score', 'path', 'distance'])
+        for i, (score, rows) in enumerate(groups, 1):
+            for file_path, distance in rows:
+                writer.writerow([i, f'{score:.3f}', file_path, distance])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Group visually similar photos (HEIC/JPEG/PNG).")
+    parser.add_argument("directory", help="Folder to scan")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into subfolders")
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=MAX_DISTANCE_DEFAULT,
+        help="Max differing hash bits out of 64 (default: %(default)s)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to hash images")
+    parser.add_argument("--report", default=REPORT_DEFAULT, help="CSV of similar sets (default: %(default)s)")
+    args = parser.parse_args()
+
+    files = walk_files(args.directory, recursive=args.recursive, extensions=IMAGE_EXTENSIONS)
+    groups = find_near_duplicates([file_path for file_path, _ in files], args.max_distance, args.workers)
+    write_report(groups, args.report)
+    print(f"{len(groups)} near-duplicate sets, report: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Plan-then-apply renaming for date-based file names (YYYYMMDD, YYYYMMDD_1, ...).
+
+plan_renames() resolves every collision up front against a hash index of the
+names already in each directory, so a 100k-file folder is planned in one
+linear pass. apply_plan() executes the plan in two phases (sources -> temp
+names -> targets) so renames that free or swap names never clobber anything,
+and records every step in a JSON-lines journal that revert_journal() can undo.
+"""
+import json
+import os
+import uuid
+from collections import Counter, namedtuple, defaultdict
+from datetime import datetime
+
+JOURNAL_DIR = os.path.join(os.path.expanduser('~'), '.photo_renamer_journals')
+
+RenameStep = namedtuple('RenameStep', ['source', 'target'])
+
+
+def _stem(filename):
+    return os.path.splitext(filename)[0]
+
+
+class NameIndex:
+    """
+    Hash index of the names in use per directory (lower-cased, since Windows
+    compares names case-insensitively) plus the next suffix to try per
+    (directory, date), so assigning a free name is O(1) amortized. A stem is
+    taken while any name uses it, whatever its extension: stems are counted,
+    so freeing IMG_1.mov leaves IMG_1.jpg's stem reserved.
+    """
+
+    def __init__(self):
+        self._names = defaultdict(set)
+        self._stems = defaultdict(Counter)
+        self._next_index = {}
+        self._listed = set()
+
+    def load(self, directory):
+        """Reserve every name currently in directory (once per directory)."""
+        if directory not in self._listed:
+            for name in os.listdir(directory):
+                self.add(os.path.join(directory, name))
+            self._listed.add(directory)
+
+    def add(self, file_path):
+        directory, filename = os.path.split(file_path)
+        name = filename.lower()
+        if name not in self._names[directory]:
+            self._names[directory].add(name)
+            self._stems[directory][_stem(name)] += 1
+
+    def discard(self, file_path):
+        directory, filename = os.path.split(file_path)
+        name = filename.lower()
+        if name in self._names[directory]:
+            self._names[directory].remove(name)
+            stems = self._stems[directory]
+            stems[_stem(name)] -= 1
+            if not stems[_stem(name)]:
+                del stems[_stem(name)]
+
+    def assign(self, file_path, date_part):
+        """Reserve and return the first free "<date>[_N]" path for file_path."""
+        directory, filename = os.path.split(file_path)
+        stems = self._stems[directory]
+        i = self._next_index.get((directory, date_part), 0)
+        while True:
+            stem = date_part if i == 0 else f'{date_part}_{i}'
+            i += 1
+            if stem.lower() not in stems:
+                break
+        self._next_index[(directory, date_part)] = i
+        target = os.path.join(directory, stem + os.path.splitext(filename)[1])
+        self.add(target)
+        return target
+
+
+def keeps_name(file_path, date_part):
+    """True when the file needs no rename: no date known or already named after it."""
+    return not date_part or _stem(os.path.basename(file_path)).split('_')[0] == date_part
+
+
+def plan_renames(entries, index=None):
+    """
+    entries: iterable of (file_path, date_part). Return a list of RenameStep.
+
+    A file whose name already starts with its date part keeps its name. All
+    other files get the first free "<date>", "<date>_1", "<date>_2", ... in
+    their directory.
+    """
+    index = index or NameIndex()
+    moving = []
+    for file_path, date_part in entries:
+        index.load(os.path.dirname(file_path))
+        if not keeps_name(file_path, date_part):
+            moving.append((file_path, date_part))
+
+    # names of files that move away are free for the others (stems only once no other extension holds them)
+    for file_path, _ in moving:
+        index.discard(file_path)
+    # stable suffixes: same input folder -> same plan
+    moving.sort(key=lambda m: (os.path.dirname(m[0]), m[1], os.path.basename(m[0])))
+
+    return [RenameStep(file_path, index.assign(file_path, date_part)) for file_path, date_part in moving]
+
+
+def new_journal_path():
+    os.makedirs(JOURNAL_DIR, exist_ok=True)
+    return os.path.join(JOURNAL_DIR, f"rename-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl")
+
+
+def _undo(steps):
+    for source, target in reversed(steps):
+        if os.path.exists(target) and not os.path.exists(source):
+            os.rename(target, source)
+
+
+def apply_plan(plan, journal_path=None, dry_run=False):
+    """
+    Execute a rename plan. On any failure the steps done so far are rolled
+    back, so the directory ends up either fully renamed or untouched.
+    """
+    if dry_run:
+        for step in plan:
+            print(f"Would rename: {os.path.basename(step.source)} -> {os.path.basename(step.target)}")
+        return plan
+
+    token = uuid.uuid4().hex[:8]
+    done = []
+    journal = open(journal_path, 'a', encoding='utf-8') if journal_path else None
+
+    def move(source, target):
+        if os.path.exists(target):
+            raise FileExistsError(target)
+        # write-ahead: the journal line exists before the rename happens
+        if journal:
+            journal.write(json.dumps({'source': source, 'target': target}, ensure_ascii=False) + '\n')
+            journal.flush()
+        os.rename(source, target)
+        done.append((source, target))
+
+    try:
+        temp_paths = []
+        for step in plan:
+            temp_path = f'{step.source}.{token}.renaming'
+            move(step.source, temp_path)
+            temp_paths.append(temp_path)
+        for step, temp_path in zip(plan, temp_paths):
+            move(temp_path, step.target)
+            print(f"Renamed: {os.path.basename(step.source)} -> {os.path.basename(step.target)}")
+    except Exception:
+        _undo(done)
+        raise
+    finally:
+        if journal:
+            journal.close()
+    return plan
+
+
+def revert_journal(journal_path):
+    """Undo every rename recorded in a journal, newest first."""
+    with open(journal_path, encoding='utf-8') as f:
+        steps = [(entry['source'], entry['target']) for entry in (json.loads(line) for line in f if line.strip())]
+    _undo(steps)
+    print(f"Reverted {len(steps)} journal steps from {journal_path}")
@@ -0,0 +1,57 @@
+"""
+Row-by-row report writers: nothing is buffered beyond the current row, so
+report size does not depend on how many files were scanned.
+
+The format is picked from the file extension:
+    .xlsx           - openpyxl write-only workbook
+    .csv            - ';'-separated, like the other renamer reports
+    .ndjson/.jsonl  - one JSON object per row, keyed by the header
+"""
+import csv
+import json
+import os
+
+from openpyxl import Workbook
+
+
+class ReportWriter:
+    def __init__(self, path, header):
+        self.path = path
+        self.header = list(header)
+        self.format = os.path.splitext(path)[1][1:].lower()
+        self._file = self._workbook = self._sheet = self._writer = None
+
+        if self.format == 'xlsx':
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._sheet.append(self.header)
+        elif self.format == 'csv':
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file, delimiter=';')
+            self._writer.writerow(self.header)
+        elif self.format in ('ndjson', 'jsonl'):
+            self._file = open(path, 'w', encoding='utf-8')
+        else:
+            raise ValueError(f"Unsupported report format: {path}")
+
+    def write(self, row):
+        if self._sheet is not None:
+            self._sheet.append(list(row))
+        elif self._writer is not None:
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps(dict(zip(self.header, row)), ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = self._sheet = None
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,53 @@
+"""
+os.scandir based directory walking shared by the renamer scans.
+
+DirEntry carries the file type from the directory listing and, on Windows,
+the full stat result as well, so each file costs at most one stat call.
+"""
+import os
+from fnmatch import fnmatch
+
+
+def _matches(patterns, name, rel_path):
+    return any(fnmatch(name, p) or fnmatch(rel_path, p) for p in patterns)
+
+
+def walk_files(directory, recursive=False, include=None, exclude=None, extensions=None):
+    """
+    Yield (file_path, stat_result) for files under directory, sorted by name
+    within each folder.
+
+    include / exclude: glob patterns matched against the file name and the
+        path relative to directory ('/' separated); excluded folders are not
+        descended into.
+    extensions: iterable of extensions without the dot, case-insensitive.
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+    extensions = {e.lower().lstrip('.') for e in extensions} if extensions else None
+
+    pending = [(directory, '')]
+    while pending:
+        current, rel_dir = pending.pop()
+        with os.scandir(current) as it:
+            entries = sorted(it, key=lambda e: e.name)
+
+        subdirs = []
+        for entry in entries:
+            rel_path = rel_dir + entry.name
+            if exclude and _matches(exclude, entry.name, rel_path):
+                continue
+            if entry.is_dir():
+                if recursive:
+                    subdirs.append((entry.path, rel_path + '/'))
+                continue
+            if not entry.is_file():
+                continue
+            if extensions is not None and os.path.splitext(entry.name)[1][1:].lower() not in extensions:
+                continue
+            if include and not _matches(include, entry.name, rel_path):
+                continue
+            yield entry.path, entry.stat()
+
+        # depth-first, in name order
+        pending.extend(reversed(subdirs))
@@ -0,0 +1,190 @@
+"""
+Watch the photo inbox and rename new arrivals as they land, instead of
+re-running rename_photos() over the whole folder by hand.
+
+Events come from watchdog (inotify on Linux, ReadDirectoryChangesW on
+Windows) when it is installed, otherwise from polling the folder listing.
+Bursts are debounced until a file's size stops changing, and collision
+suffixes come from an in-memory NameIndex built once at startup, so a new
+file is renamed without rescanning the thousands already in the folder.
+"""
+import argparse
+import os
+import queue
+import time
+
+from rename_plan import NameIndex, RenameStep, apply_plan, keeps_name, new_journal_path
+from renamer import PHOTO_EXTENSIONS, VIDEO_EXTENSIONS, rename_date, rename_photos, scan_file
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # no watchdog: fall back to polling
+    FileSystemEventHandler = object
+    Observer = None
+
+INBOX_DEFAULT = r"C:\Users\crisc\OneDrive\Pictures"
+DEBOUNCE_SECONDS = 0.3
+POLL_SECONDS = 0.25
+MEDIA_EXTENSIONS = PHOTO_EXTENSIONS + VIDEO_EXTENSIONS
+
+
+def is_media(file_path):
+    return os.path.splitext(file_path)[1][1:].lower() in MEDIA_EXTENSIONS
+
+
+class _QueueHandler(FileSystemEventHandler):
+    def __init__(self, events):
+        self.events = events
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.events.put(('changed', event.src_path))
+
+    on_modified = on_created
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.events.put(('removed', event.src_path))
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.events.put(('removed', event.src_path))
+            self.events.put(('changed', event.dest_path))
+
+
+class _Poller:
+    """Diff os.scandir listings, for systems without watchdog."""
+
+    def __init__(self, directory, events):
+        self.directory = directory
+        self.events = events
+        self._snapshot = self._listing()
+
+    def _listing(self):
+        with os.scandir(self.directory) as it:
+            return {entry.path: (entry.stat().st_size, entry.stat().st_mtime_ns) for entry in it if entry.is_file()}
+
+    def poll(self):
+        listing = self._listing()
+        for file_path, state in listing.items():
+            if self._snapshot.get(file_path) != state:
+                self.events.put(('changed', file_path))
+        for file_path in self._snapshot.keys() - listing.keys():
+            self.events.put(('removed', file_path))
+        self._snapshot = listing
+
+
+class InboxWatcher:
+    def __init__(self, directory, journal_path=None, dry_run=False):
+        self.directory = directory
+        self.journal_path = journal_path
+        self.dry_run = dry_run
+        self.events = queue.Queue()
+        self.index = NameIndex()
+        self.index.load(directory)
+        self._pending = {}     # path -> (last event time, last seen size)
+        self._ours = set()     # targets we renamed to, their events are echoes
+
+    def _on_event(self, kind, file_path):
+        if kind == 'removed':
+            self._pending.pop(file_path, None)
+            if file_path not in self._ours:
+                self.index.discard(file_path)
+            return
+        if file_path.endswith('.renaming'):
+            return
+        if file_path in self._ours:
+            self._ours.discard(file_path)
+            return
+        # every name holds its stem, sidecars included, like the names load() reserved
+        self.index.add(file_path)
+        if not is_media(file_path):
+            return
+        self._pending[file_path] = (time.monotonic(), self._pending.get(file_path, (0, None))[1])
+
+    def _ready(self):
+        """Yield pending files that had no events for DEBOUNCE_SECONDS and stopped growing."""
+        now = time.monotonic()
+        for file_path, (last_event, last_size) in list(self._pending.items()):
+            if now - last_event < DEBOUNCE_SECONDS:
+                continue
+            try:
+                size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                del self._pending[file_path]
+                continue
+            if size != last_size:
+                # still being copied: check again after another quiet period
+                self._pending[file_path] = (now, size)
+                continue
+            del self._pending[file_path]
+            yield file_path
+
+    def _rename(self, file_path):
+        try:
+            date_part = rename_date(scan_file(file_path))
+        except OSError as e:
+            print(f"Error {os.path.basename(file_path)}: {e}")
+            return
+        if keeps_name(file_path, date_part):
+            return
+        self.index.discard(file_path)
+        target = self.index.assign(file_path, date_part)
+        self._ours.add(target)
+        try:
+            apply_plan([RenameStep(file_path, target)], self.journal_path, self.dry_run)
+        except OSError as e:
+            print(f"Error {os.path.basename(file_path)}: {e}")
+            self._ours.discard(target)
+            self.index.discard(target)
+            self.index.add(file_path)
+
+    def run(self):
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_QueueHandler(self.events), self.directory, recursive=False)
+            observer.start()
+            poller = None
+            print(f"Watching {self.directory} (watchdog)")
+        else:
+            observer = None
+            poller = _Poller(self.directory, self.events)
+            print(f"Watching {self.directory} (polling every {POLL_SECONDS}s)")
+
+        try:
+            while True:
+                if poller is not None:
+                    poller.poll()
+                deadline = time.monotonic() + POLL_SECONDS
+                while True:
+                    try:
+                        self._on_event(*self.events.get(timeout=max(0.0, deadline - time.monotonic())))
+                    except queue.Empty:
+                        break
+                for file_path in self._ready():
+                    self._rename(file_path)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename photos/videos as they arrive in an inbox folder.")
+    parser.add_argument("directory", nargs="?", default=INBOX_DEFAULT, help="Inbox folder (default: %(default)s)")
+    parser.add_argument("--initial", action="store_true", help="Rename files already in the inbox first")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the renames")
+    parser.add_argument("--journal", help="Journal file (default: new file per run)")
+    args = parser.parse_args()
+
+    journal_path = None if args.dry_run else args.journal or new_journal_path()
+    if args.initial:
+        rename_photos(args.directory, dry_run=args.dry_run, journal_path=journal_path)
+    InboxWatcher(args.directory, journal_path, args.dry_run).run()
+
+
+if __name__ == "__main__":
+    main()
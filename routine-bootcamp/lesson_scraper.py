@@ -1,16 +1,46 @@
+import argparse
+import asyncio
+import codecs
+import contextlib
 import logging
+import random
 import re
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 import csv
+import json
 
 from common.cookies import load_edge_cookies
-from aiohttp import ClientSession
+from common.http_cache import ResponseCache
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 BOOTCAMP_MODULES_MD = Path(r"C:\Users\crisc\Downloads\bootcamp_modules.md")
 CSV_OUT_PATH = Path("data/bootcamp_lessons.csv")
+# lessons that resolved to videos, not fetched again for CHECKPOINT_TTL
+CHECKPOINT_PATH = Path("data/bootcamp_lessons.checkpoint.jsonl")
+COOKIE_DOMAINS = ["dataexpert.io"]
+
+# Fetching: lessons are requested concurrently, at most MAX_CONCURRENCY at a
+# time and PER_HOST_LIMIT connections per host; 429/5xx are retried with
+# exponential backoff (or the server's Retry-After)
+MAX_CONCURRENCY = 16
+PER_HOST_LIMIT = 8
+REQUEST_TIMEOUT = 30
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Lesson pages are cached on disk and revalidated with ETag / Last-Modified;
+# pages younger than HTTP_CACHE_TTL are not requested at all
+HTTP_CACHE_PATH = Path("data/http_cache.sqlite")
+HTTP_CACHE_TTL = 12 * 3600
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# after that the lesson pages are revalidated through the HTTP cache again
+CHECKPOINT_TTL = HTTP_CACHE_TTL
 
 # Regex patterns
 _MODULE_HEADER_RE = re.compile(r"^##\s+Module\s*0*(\d+)\s*-\s*(.+)$")
@@ -20,9 +50,20 @@ _LESSON_URL_RE = re.compile(r"https?://[^)]+lesson[^)]*", re.IGNORECASE)
 YOUTUBE_RE = re.compile(r"https?://(?:www\.)?youtube\.com/watch\?v=([A-Za-z0-9_-]{11})")
 SRC_FLINK_LAB_RE = re.compile(r'src="\./Flink Lab Setup_files/([A-Za-z0-9_-]{11})\.html"')
 VIDEO_FILE_RE = re.compile(r'"(?:raw_)?video_url"\s*:\s*"([^"]+?)"')
-COURSE_ID_RE = lambda title: re.compile(
-    rf'"course_id"\s*:\s*(\d+),"title"\s*:\s*"{re.escape(title.split('.')[-1].strip())}"'
+# the lesson title is captured and compared instead of compiled into a new pattern per lesson
+COURSE_ID_RE = re.compile(r'"course_id"\s*:\s*(\d+),"title"\s*:\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+# Output order: YouTube, Flink lab embeds, video files, courses. Each pattern
+# keeps its own scan: re finds a literal prefix far faster than it can try a
+# combined alternation at every position.
+VIDEO_SOURCES = (
+    ('youtube', YOUTUBE_RE),
+    ('flink', SRC_FLINK_LAB_RE),
+    ('video', VIDEO_FILE_RE),
+    ('course', COURSE_ID_RE),
 )
+# a match can start this far before the end of a streamed chunk and still be incomplete
+STREAM_OVERLAP = 8192
+STREAM_CHUNK_SIZE = 64 * 1024
 BASE_CDN = "https://content.techcreator.io/"
 BASE_COURSE_CDN = "https://content.techcreator.io/academy/5/course/"
 
@@ -67,41 +108,278 @@ def write_lessons_csv(lessons: List[dict], csv_path: Path) -> None:
                 })
 
 
+@lru_cache(maxsize=None)
+def _course_title(title: str) -> str:
+    return title.split('.')[-1].strip()
+
+
+class VideoUrlExtractor:
+    """
+    Incremental extract_video_urls(): feed() the page text as it arrives and
+    call urls() at the end. Every pattern resumes where it stopped, and only
+    the last STREAM_OVERLAP characters are kept between chunks, never the
+    whole page.
+    """
+
+    def __init__(self, title: str):
+        self._course_title = _course_title(title)
+        self._found = {kind: [] for kind, _ in VIDEO_SOURCES}
+        self._resume = {kind: 0 for kind, _ in VIDEO_SOURCES}
+        self._buffer = ''
+
+    def _add(self, kind: str, m: re.Match) -> None:
+        if kind in ('youtube', 'flink'):
+            self._found[kind].append(f"https://www.youtube.com/watch?v={m.group(1)}")
+        elif kind == 'video':
+            url = m.group(1)
+            self._found[kind].append(url if url.startswith('http') else BASE_CDN + url)
+        elif m.group(2) == self._course_title:
+            self._found[kind].append(BASE_COURSE_CDN + m.group(1))
+
+    def feed(self, text: str, final: bool = False) -> None:
+        buffer = self._buffer + text
+        cutoff = len(buffer) if final else max(0, len(buffer) - STREAM_OVERLAP)
+        for kind, pattern in VIDEO_SOURCES:
+            resume = cutoff
+            last_end = self._resume[kind]
+            for m in pattern.finditer(buffer, last_end):
+                if m.end() > cutoff:
+                    # may still grow or be cut short: scan it again with the next chunk
+                    resume = min(cutoff, m.start())
+                    break
+                self._add(kind, m)
+                last_end = m.end()
+            self._resume[kind] = max(last_end, resume)
+        keep_from = min(self._resume.values())
+        self._buffer = buffer[keep_from:]
+        for kind in self._resume:
+            self._resume[kind] -= keep_from
+
+    def urls(self) -> List[str]:
+        self.feed('', final=True)
+        return list(dict.fromkeys(url for kind, _ in VIDEO_SOURCES for url in self._found[kind]))
+
+
 def extract_video_urls(html: str, title: str) -> List[str]:
-    urls = [f"https://www.youtube.com/watch?v={vid}" for vid in YOUTUBE_RE.findall(html)]
-    urls += [f"https://www.youtube.com/watch?v={vid}" for vid in SRC_FLINK_LAB_RE.findall(html)]
-    for p in VIDEO_FILE_RE.findall(html):
-        urls.append(p if p.startswith('http') else BASE_CDN + p)
-    urls += [BASE_COURSE_CDN + cid for cid in COURSE_ID_RE(title).findall(html)]
-    return list(dict.fromkeys(urls))
-
-async def fetch_html(session: ClientSession, url: str) -> Optional[str]:
-    try:
-        async with session.get(url) as resp:
-            resp.raise_for_status()
-            return await resp.text()
-    except Exception:
-        logging.warning("Failed to fetch %s", url)
+    extractor = VideoUrlExtractor(title)
+    extractor.feed(html, final=True)
+    return extractor.urls()
+
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    # full jitter keeps retries of a burst of 429s from arriving together again
+    return random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+
+
+async def _get(session: ClientSession, url: str, handle, headers=None, retries: int = MAX_RETRIES,
+               slot: Optional[asyncio.Semaphore] = None):
+    """
+    GET url and return await handle(resp) for the final response. 429/5xx and
+    connection errors are retried with backoff; returns None once retries
+    run out or on any other HTTP error. slot (a concurrency semaphore) and
+    the pooled connection are held per request only, never while backing off.
+    """
+    for attempt in range(retries + 1):
+        try:
+            async with slot or contextlib.nullcontext(), session.get(url, headers=headers) as resp:
+                if resp.status not in RETRY_STATUSES or attempt == retries:
+                    resp.raise_for_status()
+                    return await handle(resp)
+                delay = _retry_delay(attempt, resp.headers.get('Retry-After'))
+                logging.info("HTTP %d for %s, retrying in %.1fs", resp.status, url, delay)
+        except (ClientError, asyncio.TimeoutError) as e:
+            status = getattr(e, 'status', None)
+            # other 4xx will not get better by asking again
+            if attempt == retries or (status is not None and status not in RETRY_STATUSES):
+                logging.warning("Failed to fetch %s: %s", url, e)
+                return None
+            delay = _retry_delay(attempt)
+        await asyncio.sleep(delay)
+    return None
+
+
+async def fetch_html(
+    session: ClientSession,
+    url: str,
+    retries: int = MAX_RETRIES,
+    cache: Optional[ResponseCache] = None,
+    offline: bool = False,
+    slot: Optional[asyncio.Semaphore] = None,
+) -> Optional[str]:
+    cached = cache.get(url) if cache else None
+    if cached and cache.is_fresh(cached, offline):
+        return cached.body
+    if offline:
+        logging.warning("Offline and not cached: %s", url)
         return None
 
-async def main():
+    async def read(resp) -> str:
+        if resp.status == 304 and cached:
+            cache.touch(url)
+            return cached.body
+        html = await resp.text()
+        if cache:
+            cache.put(url, html, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        return html
+
+    html = await _get(session, url, read, ResponseCache.conditional_headers(cached), retries, slot)
+    if html is None and cached:
+        logging.warning("Using the cached page of %s", url)
+        return cached.body
+    return html
+
+
+async def fetch_video_urls(
+    session: ClientSession, url: str, title: str, retries: int = MAX_RETRIES,
+    slot: Optional[asyncio.Semaphore] = None,
+) -> Optional[List[str]]:
+    """Extract the video URLs of a page while it downloads, chunk by chunk; None if it cannot be fetched."""
+
+    async def extract(resp) -> List[str]:
+        extractor = VideoUrlExtractor(title)
+        decoder = codecs.getincrementaldecoder(resp.get_encoding())(errors='replace')
+        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+            extractor.feed(decoder.decode(chunk))
+        extractor.feed(decoder.decode(b'', final=True))
+        return extractor.urls()
+
+    return await _get(session, url, extract, retries=retries, slot=slot)
+
+
+class ScrapeCheckpoint:
+    """
+    JSON-lines log of lessons that resolved to videos, one line appended (and
+    flushed) as each lesson completes, so both an interrupted run and a run
+    after new modules were added to the markdown fetch only the lessons it
+    does not hold (lessons are keyed by URL). Entries expire after ttl: the
+    page is then revalidated through the HTTP cache, whose 304s are cheap.
+    """
+
+    def __init__(self, path: Path, ttl: float = CHECKPOINT_TTL):
+        self.path = path
+        entries = {}
+        dropped = False
+        now = time.time()
+        if path.exists():
+            with path.open(encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        dropped = True
+                        continue  # torn last line of a killed run
+                    if now - entry.get('resolved_at', 0) >= ttl:
+                        dropped = True
+                        continue
+                    entries[entry['lesson_url']] = entry
+        self.done = {url: entry['video_urls'] for url, entry in entries.items()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if dropped:
+            # rewrite without expired entries and torn lines, so appends start on a clean line
+            tmp = path.with_suffix('.tmp')
+            with tmp.open('w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries.values())
+            tmp.replace(path)
+        self._file = path.open('a', encoding='utf-8')
+
+    def record(self, lesson: dict) -> None:
+        self.done[lesson['lesson_url']] = lesson['video_urls']
+        entry = {'lesson_url': lesson['lesson_url'], 'title': lesson['title'], 'video_urls': lesson['video_urls'],
+                 'resolved_at': time.time()}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+async def scrape_lessons(
+    lessons: List[dict],
+    cookie_jar=None,
+    concurrency: int = MAX_CONCURRENCY,
+    per_host_limit: int = PER_HOST_LIMIT,
+    timeout: float = REQUEST_TIMEOUT,
+    cache: Optional[ResponseCache] = None,
+    offline: bool = False,
+    checkpoint: Optional[ScrapeCheckpoint] = None,
+) -> List[dict]:
+    """
+    Fill lesson['video_urls'] for every lesson, fetching the pages concurrently.
+    With a cache, unchanged pages cost a 304 (or nothing within its TTL);
+    offline serves only what the cache holds. Without a cache the pages are
+    stream-parsed while they download. Lessons already in the checkpoint are
+    not fetched again; every lesson that yields videos is recorded in it (an
+    empty page, e.g. the login page after the cookie expired, is retried).
+    Returns the lessons whose page could not be fetched.
+    """
+    pending = []
+    for lesson in lessons:
+        if checkpoint and lesson['lesson_url'] in checkpoint.done:
+            lesson['video_urls'] = checkpoint.done[lesson['lesson_url']]
+        else:
+            pending.append(lesson)
+    if checkpoint and len(pending) < len(lessons):
+        logging.info("Resuming: %d of %d lessons already done", len(lessons) - len(pending), len(lessons))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = []
+
+    async def scrape_one(session: ClientSession, lesson: dict) -> None:
+        # the semaphore bounds requests in flight: it is released while a lesson backs off
+        if cache is None:
+            vids = await fetch_video_urls(session, lesson['lesson_url'], lesson['title'], slot=semaphore)
+        else:
+            html = await fetch_html(session, lesson['lesson_url'], cache=cache, offline=offline, slot=semaphore)
+            vids = None if html is None else extract_video_urls(html, lesson['title'])
+        lesson['video_urls'] = vids or []
+        if vids is None:
+            failed.append(lesson)
+            return
+        if checkpoint and vids:
+            checkpoint.record(lesson)
+        if cache:
+            cache.commit()
+        if vids:
+            logging.info("✅ %s -> %s", lesson['title'], vids)
+        else:
+            logging.info("❌ No videos for %s", lesson['title'])
+
+    connector = TCPConnector(limit=concurrency, limit_per_host=per_host_limit)
+    async with ClientSession(cookie_jar=cookie_jar, connector=connector, timeout=ClientTimeout(total=timeout)) as session:
+        await asyncio.gather(*(scrape_one(session, lesson) for lesson in pending))
+    return failed
+
+
+async def main(offline: bool = False, use_cache: bool = True, restart: bool = False):
     lessons = parse_lessons(BOOTCAMP_MODULES_MD)
     if not lessons:
         logging.warning("No lessons parsed; exiting.")
         return
-    jar = load_edge_cookies()
-    async with ClientSession(cookie_jar=jar) as session:
-        for lesson in lessons:
-            html = await fetch_html(session, lesson['lesson_url']) or ""
-            vids = extract_video_urls(html, lesson['title'])
-            lesson['video_urls'] = vids
-            if vids:
-                logging.info("✅ %s -> %s", lesson['title'], vids)
-            else:
-                logging.info("❌ No videos for %s", lesson['title'])
+    if restart:
+        CHECKPOINT_PATH.unlink(missing_ok=True)
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_PATH)
+    # offline needs neither the network nor the browser's cookies
+    jar = None if offline else load_edge_cookies(COOKIE_DOMAINS)
+    cache = ResponseCache(HTTP_CACHE_PATH, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES) if use_cache or offline else None
+    try:
+        failed = await scrape_lessons(lessons, jar, cache=cache, offline=offline, checkpoint=checkpoint)
+    finally:
+        checkpoint.close()
+        if cache:
+            logging.info(cache.summary())
+            cache.close()
     write_lessons_csv(lessons, CSV_OUT_PATH)
+    if failed:
+        # not in the checkpoint: the next run only retries these (and any new lessons)
+        logging.warning("%d lessons could not be fetched, run again to retry them", len(failed))
     logging.info("Processed %d lessons", len(lessons))
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scrape video URLs of the bootcamp lessons into a CSV.")
+    parser.add_argument("--offline", action="store_true", help="Use only cached lesson pages, no requests")
+    parser.add_argument("--no-cache", action="store_true", help="Download every page, ignore the HTTP cache")
+    parser.add_argument("--restart", action="store_true", help="Refetch every lesson, ignoring the checkpoint")
+    args = parser.parse_args()
+    asyncio.run(main(offline=args.offline, use_cache=not args.no_cache, restart=args.restart))
@@ -1,27 +1,13 @@
 import os
 from yt_dlp import YoutubeDL
-import rookiepy
+from common.cookies import load_cookies, write_netscape
 
 
 def save_edge_cookies_to_file(file_path: str):
     """
-    Fetch cookies from Edge via rookiepy and save them in Netscape cookie file format for yt-dlp.
+    Save the (cached) Edge cookies for the video hosts in Netscape cookie file format for yt-dlp.
     """
-    raw_cookies = rookiepy.edge()
-    with open(file_path, 'w', encoding='utf-8') as f:
-        # Header for Netscape cookie format
-        f.write('# Netscape HTTP Cookie File\n')
-        for cookie in raw_cookies:
-            domain = cookie.get('domain', '')
-            include_subdomains = 'TRUE' if domain.startswith('.') else 'FALSE'
-            path = cookie.get('path', '/')
-            secure_flag = 'TRUE' if cookie.get('secure', False) else 'FALSE'
-            # Some cookie dicts use 'expirationDate' or 'expires' for expiry timestamp
-            expiry = cookie.get('expirationDate') or cookie.get('expires') or 0
-            name = cookie.get('name', '')
-            value = cookie.get('value', '')
-            # Compose line: domain, include_subdomains, path, secure_flag, expiry, name, value
-            f.write(f"{domain}\t{include_subdomains}\t{path}\t{secure_flag}\t{expiry}\t{name}\t{value}\n")
+    write_netscape(load_cookies(['techcreator.io', 'youtube.com']), file_path)
 
 
 # List of video URLs to download
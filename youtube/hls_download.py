@@ -0,0 +1,268 @@
+"""
+Download HLS (.m3u8) lessons by fetching their segments in parallel.
+
+yt-dlp's native HLS downloader fetches segments more or less one at a time;
+here every segment is sized with a HEAD request, the output file is
+preallocated, and segments are fetched concurrently over one pooled
+keep-alive aiohttp session and written straight to their offsets.
+
+MPEG-TS segments are remuxed into MP4 with ffmpeg (the same ffmpeg yt-dlp
+uses to merge formats); fragmented-MP4 segments (#EXT-X-MAP) already form a
+playable file; the complete MPEG-TS is kept as '<output>.ts' until its remux
+succeeded, so a failed remux is retried without downloading again.
+Encrypted or byte-range playlists and variants with a separate audio
+rendition raise HLSUnsupported so the caller can fall back to yt-dlp.
+"""
+import asyncio
+import logging
+import os
+from typing import Callable, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+import aiohttp
+
+SEGMENT_CONCURRENCY = 16
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+
+class HLSUnsupported(Exception):
+    """The playlist uses features this downloader does not handle (encryption, byte ranges)."""
+
+
+class MediaPlaylist(NamedTuple):
+    segments: List[str]          # absolute URLs, in play order
+    init_segment: Optional[str]  # #EXT-X-MAP URI of fragmented-MP4 streams
+
+
+def _attributes(line: str) -> dict:
+    """'#TAG:A=1,B="x,y"' -> {'A': '1', 'B': 'x,y'}"""
+    attrs = {}
+    _, _, rest = line.partition(':')
+    key = value = ''
+    in_quotes = False
+    reading_value = False
+    for ch in rest + ',':
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == '=' and not reading_value:
+            reading_value = True
+        elif ch == ',' and not in_quotes:
+            attrs[key.strip()] = value
+            key = value = ''
+            reading_value = False
+        elif reading_value:
+            value += ch
+        else:
+            key += ch
+    return attrs
+
+
+def best_variant(text: str, base_url: str) -> Optional[str]:
+    """
+    URL of the highest-bandwidth variant of a master playlist, None for a
+    media playlist. A variant whose audio is a separate rendition (an
+    #EXT-X-MEDIA TYPE=AUDIO with a URI) raises HLSUnsupported: its own
+    segments would make a silent video.
+    """
+    best = None
+    best_audio = None
+    bandwidth = -1
+    separate_audio = set()
+    lines = iter(text.splitlines())
+    for line in lines:
+        if line.startswith('#EXT-X-MEDIA'):
+            attrs = _attributes(line)
+            if attrs.get('TYPE') == 'AUDIO' and attrs.get('URI'):
+                separate_audio.add(attrs.get('GROUP-ID'))
+        elif line.startswith('#EXT-X-STREAM-INF'):
+            attrs = _attributes(line)
+            rate = int(attrs.get('BANDWIDTH', 0) or 0)
+            uri = next((l.strip() for l in lines if l.strip() and not l.startswith('#')), None)
+            if uri and rate > bandwidth:
+                best, best_audio, bandwidth = urljoin(base_url, uri), attrs.get('AUDIO'), rate
+    if best is not None and best_audio is not None and best_audio in separate_audio:
+        raise HLSUnsupported(f'audio in a separate rendition ({best_audio})')
+    return best
+
+
+def parse_media_playlist(text: str, base_url: str) -> MediaPlaylist:
+    segments = []
+    init_segment = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith('#EXT-X-KEY'):
+            if _attributes(line).get('METHOD', 'NONE') != 'NONE':
+                raise HLSUnsupported('encrypted segments')
+        elif line.startswith('#EXT-X-BYTERANGE'):
+            raise HLSUnsupported('byte-range segments')
+        elif line.startswith('#EXT-X-MAP'):
+            attrs = _attributes(line)
+            if 'BYTERANGE' in attrs:
+                raise HLSUnsupported('byte-range init segment')
+            init_segment = urljoin(base_url, attrs['URI'])
+        elif not line.startswith('#'):
+            segments.append(urljoin(base_url, line))
+    if not segments:
+        raise HLSUnsupported('no segments in playlist')
+    return MediaPlaylist(segments, init_segment)
+
+
+async def gather_or_cancel(*coros):
+    """gather(), but the first failure cancels the other coroutines instead of leaving them running."""
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def _retrying(request: Callable, url: str):
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return await request()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logging.debug("Retrying %s after %s", url, e)
+            await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+
+
+async def _get_text(session: aiohttp.ClientSession, url: str) -> str:
+    async def request():
+        async with session.get(url, timeout=REQUEST_TIMEOUT) as resp:
+            resp.raise_for_status()
+            return await resp.text()
+    return await _retrying(request, url)
+
+
+async def _segment_size(session: aiohttp.ClientSession, url: str) -> int:
+    async def request():
+        async with session.head(url, timeout=REQUEST_TIMEOUT, allow_redirects=True) as resp:
+            resp.raise_for_status()
+            if resp.content_length is None:
+                raise HLSUnsupported(f'no Content-Length for {url}')
+            return resp.content_length
+    return await _retrying(request, url)
+
+
+async def load_playlist(session: aiohttp.ClientSession, url: str) -> MediaPlaylist:
+    text = await _get_text(session, url)
+    variant = best_variant(text, url)
+    if variant is not None:
+        url = variant
+        text = await _get_text(session, url)
+    return parse_media_playlist(text, url)
+
+
+async def _remux(source: str, output: str) -> None:
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-y', '-loglevel', 'error', '-i', source, '-c', 'copy', '-bsf:a', 'aac_adtstoasc',
+            '-f', 'mp4', output,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise HLSUnsupported('ffmpeg not found, cannot remux MPEG-TS')
+    try:
+        _, stderr = await proc.communicate()
+    except BaseException:
+        proc.kill()
+        await proc.wait()
+        raise
+    if proc.returncode:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+
+
+async def _remux_into_place(source: str, output: str) -> None:
+    """
+    Remux next to the output and move it into place only once ffmpeg
+    succeeded (a half-written output would pass for a finished lesson);
+    source is removed after that and kept on failure.
+    """
+    remux_path = output + '.remux.part'
+    try:
+        await _remux(source, remux_path)
+    except BaseException:
+        if os.path.exists(remux_path):
+            os.remove(remux_path)
+        raise
+    os.replace(remux_path, output)
+    os.remove(source)
+
+
+async def download_hls(
+    session: aiohttp.ClientSession,
+    url: str,
+    output: str,
+    progress_hook: Optional[Callable[[dict], None]] = None,
+    concurrency: int = SEGMENT_CONCURRENCY,
+) -> None:
+    """Download the stream at url into output (MP4); the session carries the cookies."""
+    playlist = await load_playlist(session, url)
+    parts = ([playlist.init_segment] if playlist.init_segment else []) + playlist.segments
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sized(part_url):
+        async with semaphore:
+            return await _segment_size(session, part_url)
+
+    sizes = await gather_or_cancel(*(sized(u) for u in parts))
+    offsets = [0]
+    for size in sizes[:-1]:
+        offsets.append(offsets[-1] + size)
+    total = offsets[-1] + sizes[-1]
+
+    # fragmented MP4 is playable as is; MPEG-TS needs a remux afterwards
+    fragmented = playlist.init_segment is not None
+    # not '.part': a yt-dlp fallback would try to continue a file with holes
+    part_path = output + ('.hls.part' if fragmented else '.ts.part')
+    # every segment of an MPEG-TS stream, kept until its remux succeeded
+    ts_path = output + '.ts'
+    if not fragmented and os.path.exists(ts_path) and os.path.getsize(ts_path) == total:
+        logging.info("Remuxing the segments downloaded before: %s", ts_path)
+        await _remux_into_place(ts_path, output)
+        if progress_hook:
+            progress_hook({'status': 'finished', 'filename': output, 'downloaded_bytes': total, 'total_bytes': total})
+        return
+    downloaded = 0
+
+    with open(part_path, 'wb') as f:
+        f.truncate(total)
+
+        async def fetch(part_url, offset, size):
+            nonlocal downloaded
+
+            async def request():
+                async with session.get(part_url, timeout=REQUEST_TIMEOUT) as resp:
+                    resp.raise_for_status()
+                    return await resp.read()
+
+            async with semaphore:
+                data = await _retrying(request, part_url)
+            if len(data) != size:
+                raise RuntimeError(f'{part_url}: got {len(data)} bytes, expected {size}')
+            # no await between seek and write, so coroutines cannot interleave here
+            f.seek(offset)
+            f.write(data)
+            downloaded += size
+            if progress_hook:
+                progress_hook({'status': 'downloading', 'filename': output,
+                               'downloaded_bytes': downloaded, 'total_bytes': total})
+
+        await gather_or_cancel(*(fetch(u, o, s) for u, o, s in zip(parts, offsets, sizes)))
+
+    if fragmented:
+        os.replace(part_path, output)
+    else:
+        # complete now: a failed remux is retried from it without downloading again
+        os.replace(part_path, ts_path)
+        await _remux_into_place(ts_path, output)
+    if progress_hook:
+        progress_hook({'status': 'finished', 'filename': output, 'downloaded_bytes': total, 'total_bytes': total})
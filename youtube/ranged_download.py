@@ -0,0 +1,211 @@
+"""
+Download a plain file (direct .mp4 lesson links) over several connections.
+
+The file is probed with a one-byte range request (HEAD is refused by some
+servers and signed URLs), preallocated, split into CHUNK_SIZE ranges and fetched by RANGE_CONNECTIONS workers; each
+response is streamed straight to its offset (os.pwrite where available), so
+no chunk is ever held in memory.
+
+Progress is kept in '<output>.ranges', a small JSON sidecar holding the
+server validators and a bitmap of finished chunks. A chunk is marked only
+after its bytes are flushed and fsynced, so an interrupted multi-GB download
+resumes with just the missing chunks. A changed ETag / Last-Modified / size
+restarts from scratch. fsync and the sidecar writes run in the default
+executor, off the event loop every native download shares.
+
+Servers without byte ranges (or refusing the probe) raise RangesUnsupported
+so the caller can fall back to yt-dlp.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from typing import Callable, NamedTuple, Optional
+
+import aiohttp
+
+from hls_download import gather_or_cancel
+
+CHUNK_SIZE = 8 * 1024 * 1024
+RANGE_CONNECTIONS = 8
+STREAM_CHUNK_SIZE = 256 * 1024
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+_CONTENT_RANGE_RE = re.compile(r'bytes (\d+)-(\d+)/(\d+|\*)')
+
+
+class RangesUnsupported(Exception):
+    """The server does not report a size or does not serve byte ranges."""
+
+
+class RemoteFile(NamedTuple):
+    url: str
+    size: int
+    validator: str  # ETag, else Last-Modified, else ''
+
+
+def _content_range(resp: aiohttp.ClientResponse):
+    """(first, last, size) of a 206 response's Content-Range; size is None for '*'."""
+    m = _CONTENT_RANGE_RE.fullmatch(resp.headers.get('Content-Range', '').strip())
+    if m is None:
+        return None
+    return int(m.group(1)), int(m.group(2)), None if m.group(3) == '*' else int(m.group(3))
+
+
+async def probe(session: aiohttp.ClientSession, url: str) -> RemoteFile:
+    # a GET of the first byte: servers that refuse HEAD (403/405, GET-only signed URLs)
+    # are probed all the same, and any refusal leaves the lesson to yt-dlp
+    async with session.get(url, headers={'Range': 'bytes=0-0'}, timeout=REQUEST_TIMEOUT) as resp:
+        if resp.status != 206:
+            raise RangesUnsupported(f'HTTP {resp.status} for a range request')
+        content_range = _content_range(resp)
+        validator = resp.headers.get('ETag') or resp.headers.get('Last-Modified') or ''
+        final_url = str(resp.url)
+    if content_range is None or content_range[:2] != (0, 0) or not content_range[2]:
+        raise RangesUnsupported(f'Content-Range={resp.headers.get("Content-Range", "-")}')
+    return RemoteFile(final_url, content_range[2], validator)
+
+
+class ChunkBitmap:
+    """One bit per chunk, persisted next to the partial file."""
+
+    def __init__(self, path: str, remote: RemoteFile, chunk_size: int):
+        self.path = path
+        self.remote = remote
+        self.chunk_size = chunk_size
+        self.chunks = -(-remote.size // chunk_size)
+        self.bits = bytearray(-(-self.chunks // 8))
+        self._lock = threading.Lock()  # saves run in executor threads
+
+    @classmethod
+    def load(cls, path: str, remote: RemoteFile, chunk_size: int) -> Optional['ChunkBitmap']:
+        """The saved bitmap if it belongs to the same remote file, else None."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get('size'), state.get('validator'), state.get('chunk_size')) != (
+                remote.size, remote.validator, chunk_size):
+            return None
+        bitmap = cls(path, remote, chunk_size)
+        done = bytes.fromhex(state['done'])
+        if len(done) != len(bitmap.bits):
+            return None
+        bitmap.bits[:] = done
+        return bitmap
+
+    def is_done(self, index: int) -> bool:
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def mark(self, index: int) -> None:
+        """Set the chunk's bit; save() persists it."""
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def missing(self):
+        return [i for i in range(self.chunks) if not self.is_done(i)]
+
+    def save(self) -> None:
+        with self._lock:
+            state = {'url': self.remote.url, 'size': self.remote.size, 'validator': self.remote.validator,
+                     'chunk_size': self.chunk_size, 'done': self.bits.hex()}
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.path)
+
+
+def _write_at(f, offset: int, data: bytes) -> None:
+    if hasattr(os, 'pwrite'):
+        os.pwrite(f.fileno(), data, offset)
+    else:
+        # Windows: no await between seek and write, so coroutines cannot interleave here
+        f.seek(offset)
+        f.write(data)
+
+
+async def download_ranged(
+    session: aiohttp.ClientSession,
+    url: str,
+    output: str,
+    progress_hook: Optional[Callable[[dict], None]] = None,
+    connections: int = RANGE_CONNECTIONS,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    remote = await probe(session, url)
+    loop = asyncio.get_running_loop()
+    part_path = output + '.ranged.part'  # not '.part': yt-dlp would append to a file with holes
+    bitmap_path = output + '.ranges'
+
+    bitmap = ChunkBitmap.load(bitmap_path, remote, chunk_size) if os.path.exists(part_path) else None
+    if bitmap is None:
+        bitmap = ChunkBitmap(bitmap_path, remote, chunk_size)
+        with open(part_path, 'wb') as f:
+            f.truncate(remote.size)
+        await loop.run_in_executor(None, bitmap.save)
+    pending = bitmap.missing()
+    if len(pending) < bitmap.chunks:
+        logging.info("Resuming %s: %d/%d chunks left", os.path.basename(output), len(pending), bitmap.chunks)
+
+    downloaded = remote.size - sum(min(chunk_size, remote.size - i * chunk_size) for i in pending)
+    queue = asyncio.Queue()
+    for index in pending:
+        queue.put_nowait(index)
+
+    with open(part_path, 'r+b') as f:
+
+        async def fetch_chunk(index):
+            nonlocal downloaded
+            start = index * chunk_size
+            end = min(start + chunk_size, remote.size) - 1
+            headers = {'Range': f'bytes={start}-{end}'}
+            if remote.validator:
+                headers['If-Range'] = remote.validator
+            for attempt in range(MAX_RETRIES + 1):
+                written = 0
+                try:
+                    async with session.get(remote.url, headers=headers, timeout=REQUEST_TIMEOUT) as resp:
+                        if resp.status != 206:
+                            resp.raise_for_status()
+                            raise RangesUnsupported(f'HTTP {resp.status} for a range request')
+                        content_range = _content_range(resp)
+                        if content_range is None or content_range[:2] != (start, end):
+                            raise RangesUnsupported(f'asked for bytes {start}-{end}, got Content-Range='
+                                                    f'{resp.headers.get("Content-Range", "-")}')
+                        async for data in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+                            if start + written + len(data) > end + 1:
+                                raise aiohttp.ClientPayloadError('range response longer than requested')
+                            _write_at(f, start + written, data)
+                            written += len(data)
+                            downloaded += len(data)
+                            if progress_hook:
+                                progress_hook({'status': 'downloading', 'filename': output,
+                                               'downloaded_bytes': downloaded, 'total_bytes': remote.size})
+                    if written != end - start + 1:
+                        raise aiohttp.ClientPayloadError(f'range cut short at {written} bytes')
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    downloaded -= written
+                    if attempt == MAX_RETRIES:
+                        raise
+                    logging.debug("Retrying bytes %d-%d of %s after %s", start, end, url, e)
+                    await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+            f.flush()
+            await loop.run_in_executor(None, os.fsync, f.fileno())
+            bitmap.mark(index)
+            await loop.run_in_executor(None, bitmap.save)
+
+        async def worker():
+            while not queue.empty():
+                await fetch_chunk(queue.get_nowait())
+
+        await gather_or_cancel(*(worker() for _ in range(min(connections, len(pending)))))
+
+    os.replace(part_path, output)
+    os.remove(bitmap_path)
+    if progress_hook:
+        progress_hook({'status': 'finished', 'filename': output,
+                       'downloaded_bytes': remote.size, 'total_bytes': remote.size})
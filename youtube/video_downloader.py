@@ -1,25 +1,42 @@
+import asyncio
 import csv
+import hashlib
+import json
 import logging
+import os
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
+import aiohttp
 from yt_dlp import YoutubeDL
-from common.cookies import load_edge_cookies  # your in-house cookie loader
+from common.cookies import load_cookies, to_cookiejar, write_netscape  # your in-house cookie loader
+from hls_download import HLSUnsupported, download_hls
+from ranged_download import RangesUnsupported, download_ranged
 
 # ——— CONFIG —————————————————————————————————————————————————————————
 BASE_PATH = Path(r"C:\Users\crisc\Desktop\DataExpert.io Boot Camp")
 CSV_FILE  = Path("data/bootcamp_lessons.csv")
+MANIFEST_FILE = Path("data/download_manifest.jsonl")
 YDL_FORMAT = "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best"
+JOBS = 6                      # lessons downloaded at the same time
+HOST_LIMITS = {               # downloads running against one host at a time
+    "youtube": 2,
+    "content.techcreator.io": 4,
+}
+DEFAULT_HOST_LIMIT = 2
+PROGRESS_INTERVAL = 5         # seconds between aggregated progress lines
+COOKIE_DOMAINS = ["techcreator.io", "dataexpert.io", "youtube.com"]
+HOST_CONNECTIONS = 16         # pooled connections per host for native HLS / ranged downloads
 # ———————————————————————————————————————————————————————————————
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 
-def cookiejar_to_header(cj):
-    """Serialize aiohttp.CookieJar into a single Cookie header."""
-    return "; ".join(f"{c.key}={c.value}" for c in cj)
-
-
 def load_lessons(csv_path: Path):
     lessons = {}
     with csv_path.open(newline="", encoding="utf-8") as f:
@@ -39,46 +56,276 @@ def load_lessons(csv_path: Path):
     return lessons
 
 
-async def main():
-    # build headers from Edge cookies
-    cj = load_edge_cookies()
-    headers = {"Cookie": cookiejar_to_header(cj)}
+def host_key(url: str) -> str:
+    """Group URLs by the server that limits them: every YouTube host counts as one."""
+    host = urlsplit(url).hostname or ""
+    if host == "youtu.be" or host.endswith("youtube.com"):
+        return "youtube"
+    return host
+
+
+class HostSlots:
+    """One semaphore per host, so a host never sees more than its limit; used on the event loop."""
+
+    def __init__(self, limits=HOST_LIMITS, default=DEFAULT_HOST_LIMIT):
+        self._limits = limits
+        self._default = default
+        self._slots = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        key = host_key(url)
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self._limits.get(key, self._default))
+        return self._slots[key]
+
+
+class DownloadProgress:
+    """Totals of every running download, fed by the yt-dlp progress hooks of all threads."""
+
+    def __init__(self, lessons: int):
+        self.lessons = lessons
+        self.done = 0
+        self.failed = 0
+        self._bytes = {}        # file being written -> bytes so far
+        self._active = set()
+        self._lock = threading.Lock()
+        self._last = (time.monotonic(), 0)
+
+    def hook(self, d: dict) -> None:
+        if d.get("status") in ("downloading", "finished"):
+            with self._lock:
+                self._bytes[d.get("filename")] = d.get("downloaded_bytes") or d.get("total_bytes") or 0
+
+    def started(self, title: str) -> None:
+        with self._lock:
+            self._active.add(title)
+
+    def finished(self, title: str, ok: bool) -> None:
+        with self._lock:
+            self._active.discard(title)
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    def line(self) -> str:
+        with self._lock:
+            total = sum(self._bytes.values())
+            active = len(self._active)
+        now = time.monotonic()
+        then, before = self._last
+        self._last = (now, total)
+        speed = (total - before) / (now - then) if now > then else 0.0
+        return (f"Progress: {self.done + self.failed}/{self.lessons} lessons ({self.failed} failed), "
+                f"{active} downloading, {total / 1024 ** 3:.2f} GB at {speed / 1024 ** 2:.1f} MB/s")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    JSON-lines log of finished downloads (URL, output path, size, sha256),
+    one line appended and flushed per lesson. A lesson whose output still has
+    the recorded size is skipped with a single stat(), before yt-dlp or the
+    network are involved.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done = {}
+        if path.exists():
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line of a killed run
+                    self.done[entry["path"]] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def is_done(self, output: str) -> bool:
+        entry = self.done.get(output)
+        if entry is None:
+            return False
+        try:
+            return os.stat(output).st_size == entry["size"]
+        except OSError:
+            return False
+
+    def record(self, url: str, output: str) -> None:
+        """Hash the finished file and append it; called from worker threads."""
+        entry = {"url": url, "path": output, "size": os.stat(output).st_size, "sha256": file_sha256(output)}
+        with self._lock:
+            self.done[output] = entry
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
 
-    ydl_opts = {
-        "format":    YDL_FORMAT,
-        "http_headers": headers,
-        # "quiet":     True,
-        # "no_warnings": True,
-    }
 
+# files that exist next to an output while one of the downloaders is still (or was) writing it:
+# yt-dlp's .part / .ytdl, the native HLS and ranged downloads' partial files, the MPEG-TS
+# segments awaiting their remux and the remux itself
+PARTIAL_SUFFIXES = (".part", ".ytdl", ".hls.part", ".ts.part", ".ts", ".remux.part", ".ranged.part", ".ranges")
+
+
+def complete_output(output: str) -> bool:
+    """True when output exists and no download of it was left unfinished."""
+    try:
+        if os.stat(output).st_size == 0:
+            return False
+    except OSError:
+        return False
+    return not any(os.path.exists(output + suffix) for suffix in PARTIAL_SUFFIXES)
+
+
+def lesson_outtmpl(module: str, title: str) -> str:
+    safe_title = re.sub(r'\s+', ' ', re.sub(r'[^A-Za-z0-9 _-]+', ' ', title)).strip()
+    return str((BASE_PATH / module / f"{safe_title}.mp4").resolve())
+
+
+# URL path suffix -> native downloader used instead of yt-dlp
+NATIVE_DOWNLOADERS = {
+    ".m3u8": download_hls,
+    ".mp4": download_ranged,
+}
+
+
+def native_downloader(url: str):
+    path = urlsplit(url).path.lower()
+    return next((fn for suffix, fn in NATIVE_DOWNLOADERS.items() if path.endswith(suffix)), None)
+
+
+def ydl_download(url: str, outtmpl: str, ydl_opts: dict, progress: DownloadProgress) -> None:
+    """One yt-dlp attempt; runs in a worker thread."""
+    # one YoutubeDL per attempt: instances are not safe to share between threads
+    opts = dict(ydl_opts, outtmpl=outtmpl, progress_hooks=[progress.hook])
+    with YoutubeDL(opts) as ydl:
+        ydl.download([url])
+
+
+async def download_lesson(module: str, title: str, urls, ydl_opts: dict, host_slots: HostSlots,
+                          job_slots: asyncio.Semaphore, pool: ThreadPoolExecutor, progress: DownloadProgress,
+                          manifest: DownloadManifest, session: aiohttp.ClientSession | None = None) -> bool:
+    """
+    Try the lesson's URLs in order (MP4 first) until one downloads. An
+    attempt waits for its host's slot before taking one of the JOBS slots,
+    so lessons queued behind a busy host hold no worker thread while other
+    hosts could be downloading. yt-dlp runs in pool; native HLS / ranged
+    downloads run on the loop over session.
+    """
+    loop = asyncio.get_running_loop()
+    outtmpl = lesson_outtmpl(module, title)
+    if complete_output(outtmpl):
+        # downloaded before the manifest existed: every downloader moves only finished files into place
+        await loop.run_in_executor(None, manifest.record, urls[0], outtmpl)
+        logging.info("⏭️  Already downloaded: %s", outtmpl)
+        progress.finished(title, True)
+        return True
+    if os.path.exists(outtmpl):
+        # next to leftovers of an unfinished download: yt-dlp would take it as finished
+        logging.info("Replacing unfinished %s", outtmpl)
+        os.remove(outtmpl)
+
+    Path(outtmpl).parent.mkdir(parents=True, exist_ok=True)
+    progress.started(title)
+    ok = False
+    for url in urls:
+        try:
+            async with host_slots(url), job_slots:
+                logging.info("Downloading %r from %s", title, url)
+                native = native_downloader(url) if session is not None else None
+                if native is not None:
+                    try:
+                        await native(session, url, outtmpl, progress.hook)
+                    except (HLSUnsupported, RangesUnsupported) as e:
+                        logging.info("Native download not possible (%s), using yt-dlp", e)
+                        await loop.run_in_executor(pool, ydl_download, url, outtmpl, ydl_opts, progress)
+                else:
+                    await loop.run_in_executor(pool, ydl_download, url, outtmpl, ydl_opts, progress)
+            # hashing a multi-GB lesson must not stall the loop
+            await loop.run_in_executor(None, manifest.record, url, outtmpl)
+            logging.info("✅ Success: %s", outtmpl)
+            ok = True
+            break
+        except Exception as e:
+            logging.warning("❌ Failed (%s): %s", url, e)
+    else:
+        # only reached if no break occurred
+        logging.error("⚠️  All URLs failed for %r", title)
+    progress.finished(title, ok)
+    return ok
+
+
+async def report_progress(progress: DownloadProgress) -> None:
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL)
+        logging.info(progress.line())
+
+
+async def main(jobs: int = JOBS):
     lessons = load_lessons(CSV_FILE)
     if not lessons:
         logging.error("No lessons found in %s", CSV_FILE)
         return
 
-    with YoutubeDL(ydl_opts) as ydl:
-        for (module, title), urls in lessons.items():
-            target_dir = BASE_PATH / module
-            target_dir.mkdir(parents=True, exist_ok=True)
-
-            safe_title = re.sub(r'\s+', ' ', re.sub(r'[^A-Za-z0-9 _-]+', ' ', title)).strip()
-            outtmpl = str((target_dir / f"{safe_title}.mp4").resolve())
-            ydl.params["outtmpl"] = outtmpl
-
-            for url in urls:
-                try:
-                    print(url)
-                    logging.info("Downloading %r from %s", title, url)
-                    ydl.download([url])
-                    logging.info("✅ Success: %s", outtmpl)
-                    break
-                except Exception as e:
-                    logging.warning("❌ Failed (%s): %s", url, e)
-            else:
-                # only reached if no break occurred
-                logging.error("⚠️  All URLs failed for %r", title)
+    manifest = DownloadManifest(MANIFEST_FILE)
+    pending = {key: urls for key, urls in lessons.items() if not manifest.is_done(lesson_outtmpl(*key))}
+    logging.info("%d/%d lessons already downloaded", len(lessons) - len(pending), len(lessons))
+    if not pending:
+        manifest.close()
+        return
+
+    # Edge cookies (cached by common.cookies); yt-dlp scopes a cookiefile per host itself,
+    # unlike one Cookie header that would go to every host
+    cookies = load_cookies(COOKIE_DOMAINS)
+    fd, cookie_file = tempfile.mkstemp(prefix="cookies-", suffix=".txt")
+    os.close(fd)
+    write_netscape(cookies, cookie_file)
+
+    ydl_opts = {
+        "format":    YDL_FORMAT,
+        "cookiefile": cookie_file,
+        # per-file progress bars of parallel downloads would overwrite each other
+        "noprogress": True,
+        # resume interrupted downloads from their .part files
+        "continuedl": True,
+        "nopart": False,
+        # "quiet":     True,
+        # "no_warnings": True,
+    }
+
+    host_slots = HostSlots()
+    job_slots = asyncio.Semaphore(jobs)
+    progress = DownloadProgress(len(pending))
+    reporter = asyncio.create_task(report_progress(progress))
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=HOST_CONNECTIONS)
+    # yt-dlp threads; job_slots keeps every one of them downloading, none waits for a host
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    try:
+        async with aiohttp.ClientSession(cookie_jar=to_cookiejar(cookies), connector=connector) as session:
+            await asyncio.gather(*(
+                download_lesson(module, title, urls, ydl_opts, host_slots, job_slots, pool, progress,
+                                manifest, session)
+                for (module, title), urls in pending.items()
+            ))
+    finally:
+        # an interrupted yt-dlp thread cannot be stopped: don't block the exit on it
+        pool.shutdown(wait=False, cancel_futures=True)
+        reporter.cancel()
+        manifest.close()
+        os.remove(cookie_file)
+    logging.info(progress.line())
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -34,15 +34,29 @@ Quick start
 
 The first run opens a URL—paste the auth code. From then on, your playlists
 (cached token) are downloaded silently.
+
+Incremental sync
+----------------
+With `--incremental` the Markdown is not rewritten: ETags and the known
+videos of every playlist are kept in `playlists_state.json`, unchanged
+playlists cost one conditional request (304), and only added / removed
+videos are patched into their section, so lines already cleaned out by hand
+stay gone. A playlist whose item count is unchanged is only re-read when its
+first page changed, so a same-count swap further down is picked up by the
+next full export.
 """
 
 from __future__ import annotations
 
+import json
 import os
+import re
 import sys
+import threading
 from argparse import ArgumentParser, RawTextHelpFormatter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from googleapiclient.discovery import build
@@ -59,6 +73,10 @@ SCOPES = ["https://www.googleapis.com/auth/youtube.readonly"]
 OUTPUT_DEFAULT_FILE = r"C:\\Users\\crisc\\iCloudDrive\\iCloud~md~obsidian\\personal-info\\Routine\\Content to Clean.md"
 CLIENT_SECRETS_DEFAULT = r"C:\\Users\\crisc\\client_secret_666632475794-r3cdbl1nob8r908fu86hvl6r6hn4ep7l.apps.googleusercontent.com.json"  # Put your file here or pass --client-secrets
 TOKEN_DEFAULT = "token.json"
+STATE_DEFAULT = "playlists_state.json"
+WORKERS_DEFAULT = 4         # playlists paged at the same time
+IDS_PER_REQUEST = 50        # API maximum for playlists().list(id=...)
+ITEM_FIELDS = "etag,nextPageToken,items(snippet(title,resourceId/videoId))"
 
 PLAYLIST_URLS = [
     "https://www.youtube.com/playlist?list=PLfIWBOpdRR6fXC5rv_znBdlBn6d7O5gAb",
@@ -87,8 +105,8 @@ def _extract_playlist_id(url_or_id: str) -> str:
     return url_or_id  # Assume caller already provided the ID
 
 
-def _get_authenticated_service(client_secrets: Path, token_path: Path):
-    """Return an authorised YouTube API service object."""
+def _get_credentials(client_secrets: Path, token_path: Path) -> Credentials:
+    """Return OAuth user credentials, running the consent flow if needed."""
     creds: Credentials | None = None
     if token_path.exists():
         creds = Credentials.from_authorized_user_file(token_path, SCOPES)
@@ -108,45 +126,304 @@ def _get_authenticated_service(client_secrets: Path, token_path: Path):
                 creds = flow.run_local_server(port=0, prompt="consent")  # Opens URL, prompts for code
         # Cache
         token_path.write_text(creds.to_json())
-    return build(API_SERVICE_NAME, API_VERSION, credentials=creds, cache_discovery=False)
+    return creds
 
 
-def playlist_to_markdown(youtube, playlist_id: str) -> str:
-    """Return a Markdown fragment for a single playlist (all items)."""
-    # Fetch playlist title
-    pl_resp = (
-        youtube.playlists().list(part="snippet", id=playlist_id, maxResults=1).execute()
-    )
-    if not pl_resp["items"]:
-        raise ValueError(f"No playlist found for ID {playlist_id}")
-    title = pl_resp["items"][0]["snippet"]["title"]
-    lines = [f"# {title}"]
+def _service_factory(creds: Credentials) -> Callable:
+    """
+    Return a function giving each thread its own YouTube API service: the
+    httplib2 connection inside a service object is not thread-safe.
+    """
+    local = threading.local()
+
+    def service():
+        if not hasattr(local, "youtube"):
+            local.youtube = build(API_SERVICE_NAME, API_VERSION, credentials=creds, cache_discovery=False)
+        return local.youtube
+
+    return service
 
-    # Paginate through playlist items
+
+class PlaylistInfo(NamedTuple):
+    title: str
+    etag: str
+
+
+def _not_modified(exc: HttpError) -> bool:
+    return getattr(exc.resp, "status", None) == 304
+
+
+def fetch_playlist_info(
+    youtube, playlist_ids: List[str], etag: str | None = None
+) -> Tuple[Dict[str, PlaylistInfo], str | None] | None:
+    """
+    ({id: PlaylistInfo}, response ETag) for all playlists, IDS_PER_REQUEST per
+    playlists().list call; unknown IDs are left out. With etag (only used
+    when all IDs fit in one call) a 304 returns None: no playlist changed.
+    """
+    def request(ids, if_none_match=None):
+        req = youtube.playlists().list(
+            part="snippet,contentDetails",
+            id=",".join(ids),
+            maxResults=IDS_PER_REQUEST,
+            fields="etag,items(id,etag,snippet/title)",
+        )
+        if if_none_match:
+            req.headers["If-None-Match"] = if_none_match
+        return req.execute()
+
+    unique_ids = list(dict.fromkeys(playlist_ids))
+    chunks = [unique_ids[i:i + IDS_PER_REQUEST] for i in range(0, len(unique_ids), IDS_PER_REQUEST)]
+    infos = {}
+    batch_etag = None
+    for chunk in chunks:
+        try:
+            resp = request(chunk, etag if len(chunks) == 1 else None)
+        except HttpError as exc:
+            if _not_modified(exc):
+                return None
+            raise
+        if len(chunks) == 1:
+            batch_etag = resp.get("etag")
+        for item in resp.get("items", []):
+            infos[item["id"]] = PlaylistInfo(item["snippet"]["title"], item["etag"])
+    # special lists (LL) can come back under the user's real playlist ID: ask for them alone
+    for playlist_id in unique_ids:
+        if playlist_id not in infos:
+            items = request([playlist_id]).get("items", [])
+            if len(items) == 1:
+                infos[playlist_id] = PlaylistInfo(items[0]["snippet"]["title"], items[0]["etag"])
+    return infos, batch_etag
+
+
+def fetch_playlist_titles(youtube, playlist_ids: List[str]) -> Dict[str, str]:
+    """Titles of all playlists, batched as in fetch_playlist_info(); unknown IDs are left out."""
+    infos, _ = fetch_playlist_info(youtube, playlist_ids)
+    return {pid: info.title for pid, info in infos.items()}
+
+
+def fetch_playlist_items(
+    youtube, playlist_id: str, etag: str | None = None
+) -> Tuple[List[Tuple[str, str]], str] | None:
+    """
+    (all (video ID, title) pairs, ETag of the first page), paging 50 at a
+    time. With etag, a 304 on the first page returns None: unchanged.
+    """
+    items = []
+    first_etag = ""
     page_token = None
     while True:
-        items_resp = (
-            youtube.playlistItems()
-            .list(
-                part="snippet",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=page_token,
-            )
-            .execute()
+        req = youtube.playlistItems().list(
+            part="snippet",
+            playlistId=playlist_id,
+            maxResults=50,
+            pageToken=page_token,
+            fields=ITEM_FIELDS,
         )
+        if etag and page_token is None:
+            req.headers["If-None-Match"] = etag
+        try:
+            items_resp = req.execute()
+        except HttpError as exc:
+            if etag and page_token is None and _not_modified(exc):
+                return None
+            raise
+        if page_token is None:
+            first_etag = items_resp.get("etag", "")
         for item in items_resp["items"]:
             s = item["snippet"]
-            vid_id = s["resourceId"]["videoId"]
-            vid_title = s["title"]
-            lines.append(f"- [{vid_title}](https://www.youtube.com/watch?v={vid_id})")
+            items.append((s["resourceId"]["videoId"], s["title"]))
         page_token = items_resp.get("nextPageToken")
         if not page_token:
             break
+    return items, first_etag
 
+
+def render_playlist(title: str, items: List[Tuple[str, str]]) -> str:
+    lines = [f"# {title}"]
+    for vid_id, vid_title in items:
+        lines.append(f"- [{vid_title}](https://www.youtube.com/watch?v={vid_id})")
     return "\n".join(lines) + "\n\n"
 
 
+def playlist_to_markdown(youtube, playlist_id: str) -> str:
+    """Return a Markdown fragment for a single playlist (all items)."""
+    title = fetch_playlist_titles(youtube, [playlist_id]).get(playlist_id)
+    if title is None:
+        raise ValueError(f"No playlist found for ID {playlist_id}")
+    items, _ = fetch_playlist_items(youtube, playlist_id)
+    return render_playlist(title, items)
+
+
+def fetch_playlists(
+    service: Callable, playlist_ids: List[str], workers: int = WORKERS_DEFAULT, state: dict | None = None
+):
+    """
+    Fetch every playlist: (batch ETag, {id: PlaylistInfo}, {id: result}) where
+    result is (items, first-page ETag), None when unchanged since state, or
+    the exception that prevented it.
+
+    Titles come from batched playlists().list calls; the item pages of
+    different playlists are fetched concurrently (pages of one playlist are
+    chained by pageToken, so stay sequential).
+    """
+    known = (state or {}).get("playlists", {})
+    # a 304 can only restore stored playlists, and one that failed last time never was:
+    # ask conditionally only when all of them are stored
+    conditional = (state is not None and state.get("playlist_ids") == playlist_ids
+                   and all(pid in known for pid in playlist_ids))
+    fetched = fetch_playlist_info(service(), playlist_ids, state.get("etag") if conditional else None)
+    if fetched is None:
+        # 304: titles and item counts are as stored, items may still have been swapped
+        infos = {pid: PlaylistInfo(p["title"], p["etag"]) for pid, p in known.items()}
+        batch_etag = state["etag"]
+    else:
+        infos, batch_etag = fetched
+
+    def one(playlist_id: str):
+        info = infos.get(playlist_id)
+        if info is None:
+            return ValueError(f"No playlist found for ID {playlist_id}")
+        old = known.get(playlist_id)
+        # the playlist resource changes with its item count; the first page catches
+        # same-count edits near the top (where liked videos are added)
+        etag = old["items_etag"] if old and old["etag"] == info.etag else None
+        try:
+            return fetch_playlist_items(service(), playlist_id, etag)
+        except Exception as exc:
+            return exc
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(playlist_ids, pool.map(one, playlist_ids)))
+    return batch_etag, infos, results
+
+
+def playlists_to_markdown(
+    service: Callable, playlist_ids: List[str], workers: int = WORKERS_DEFAULT
+) -> List[str | Exception]:
+    """Markdown fragment (or the exception that prevented it) per playlist, in the order of playlist_ids."""
+    try:
+        _, infos, results = fetch_playlists(service, playlist_ids, workers)
+    except HttpError as exc:
+        return [exc] * len(playlist_ids)
+    return [
+        r if isinstance(r, Exception) else render_playlist(infos[pid].title, r[0])
+        for pid, r in ((pid, results[pid]) for pid in playlist_ids)
+    ]
+
+
+# ── Incremental sync ───────────────────────────────────────────────────────
+
+_VIDEO_ID_RE = re.compile(r"watch\?v=([A-Za-z0-9_-]{11})\)")
+
+
+def load_state(state_path: Path) -> dict | None:
+    try:
+        return json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(state_path: Path, state: dict) -> None:
+    tmp = state_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(state_path)
+
+
+def _section(lines: List[str], title: str) -> Tuple[int, int] | None:
+    """(heading index, end index) of the '# title' section, None if absent."""
+    try:
+        start = lines.index(f"# {title}")
+    except ValueError:
+        return None
+    end = next((i for i in range(start + 1, len(lines)) if lines[i].startswith("# ")), len(lines))
+    return start, end
+
+
+def patch_section(body: List[str], old_items, new_items) -> List[str]:
+    """
+    Apply the difference between old_items and new_items to a section's
+    lines: removed videos lose their line, added ones are inserted after the
+    video preceding them in the playlist (unless the section already lists
+    them). Lines not mentioned (including ones already cleaned out by hand)
+    are left alone.
+    """
+    old_ids = {vid for vid, _ in old_items}
+    new_ids = {vid for vid, _ in new_items}
+    removed = old_ids - new_ids
+    kept = [line for line in body if not ((m := _VIDEO_ID_RE.search(line)) and m.group(1) in removed)]
+    present = {m.group(1) for line in kept if (m := _VIDEO_ID_RE.search(line))}
+
+    inserts: Dict[str | None, List[str]] = {}
+    anchor = None
+    for vid, title in new_items:
+        if vid in old_ids:
+            if vid in present:
+                anchor = vid
+        elif vid not in present:
+            inserts.setdefault(anchor, []).append(f"- [{title}](https://www.youtube.com/watch?v={vid})")
+
+    patched = list(inserts.get(None, []))
+    for line in kept:
+        patched.append(line)
+        m = _VIDEO_ID_RE.search(line)
+        if m:
+            patched.extend(inserts.get(m.group(1), []))
+    return patched
+
+
+def sync_markdown(md_path: Path, state_path: Path, service: Callable, playlist_ids: List[str],
+                  raw_urls: List[str], workers: int = WORKERS_DEFAULT) -> None:
+    """Patch only what changed since the last run into md_path (full export when there is no state)."""
+    state = load_state(state_path) if md_path.exists() else None
+    batch_etag, infos, results = fetch_playlists(service, playlist_ids, workers, state)
+    if state is not None and all(results[pid] is None for pid in playlist_ids):
+        print("✔ No playlist changed")
+        return
+
+    lines = md_path.read_text(encoding="utf-8").split("\n") if state is not None else []
+    known = dict(state["playlists"]) if state is not None else {}
+    for index, (pid, src) in enumerate(zip(playlist_ids, raw_urls)):
+        result = results[pid]
+        if isinstance(result, Exception):
+            print(f"✘ Failed {src}: {result}", file=sys.stderr)
+            continue
+        if result is None:
+            continue
+        items, items_etag = result
+        info = infos[pid]
+        old = known.get(pid)
+        span = _section(lines, old["title"]) if old else None
+        if span is None:
+            # new playlist: before the section of the next playlist we have, else at the end
+            at = next((s[0] for p in playlist_ids[index + 1:] if p in known
+                       and (s := _section(lines, known[p]["title"]))), None)
+            fragment = render_playlist(info.title, items).split("\n")[:-1]
+            if at is None:
+                if lines and lines[-1] == "":
+                    lines.pop()
+                lines[len(lines):] = fragment + [""]
+            else:
+                lines[at:at] = fragment
+            print(f"✔ Added {src}")
+        else:
+            start, end = span
+            old_items = [tuple(v) for v in old["videos"]]
+            lines[start + 1:end] = patch_section(lines[start + 1:end], old_items, items)
+            lines[start] = f"# {info.title}"
+            added = len({v for v, _ in items} - {v for v, _ in old_items})
+            removed = len({v for v, _ in old_items} - {v for v, _ in items})
+            print(f"✔ Synced {src}: +{added} -{removed}")
+        known[pid] = {"title": info.title, "etag": info.etag, "items_etag": items_etag,
+                      "videos": [list(v) for v in items]}
+
+    md_path.write_text("\n".join(lines), encoding="utf-8")
+    # a failed playlist keeps its old entry: the batch must not answer 304 for it next time
+    if any(isinstance(r, Exception) for r in results.values()):
+        batch_etag = None
+    save_state(state_path, {"playlist_ids": playlist_ids, "etag": batch_etag, "playlists": known})
+
+
 def main(argv: List[str] | None = None) -> None:
     parser = ArgumentParser(
         formatter_class=RawTextHelpFormatter,
@@ -171,6 +448,22 @@ def main(argv: List[str] | None = None) -> None:
         default=TOKEN_DEFAULT,
         help="Path to cache the OAuth token (default token.json).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS_DEFAULT,
+        help=f"Playlists fetched at the same time (default {WORKERS_DEFAULT}).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Patch only added/removed videos into the existing output instead of rewriting it.",
+    )
+    parser.add_argument(
+        "--state",
+        default=STATE_DEFAULT,
+        help=f"Path of the sync state (ETags, known videos) for --incremental (default {STATE_DEFAULT}).",
+    )
     parser.add_argument(
         "urls",
         nargs="*",
@@ -186,7 +479,7 @@ def main(argv: List[str] | None = None) -> None:
             "Download it from Google Cloud Console → Credentials → OAuth 2.0 Client IDs."
         )
 
-    youtube = _get_authenticated_service(client_secrets_path, Path(ns.token).expanduser())
+    creds = _get_credentials(client_secrets_path, Path(ns.token).expanduser())
 
     raw_urls = ns.urls or PLAYLIST_URLS
     playlist_ids = [_extract_playlist_id(u) for u in raw_urls]
@@ -194,13 +487,23 @@ def main(argv: List[str] | None = None) -> None:
     md_path = Path(ns.output).expanduser().resolve()
     md_path.parent.mkdir(parents=True, exist_ok=True)
 
+    if ns.incremental:
+        sync_markdown(md_path, Path(ns.state).expanduser(), _service_factory(creds), playlist_ids, raw_urls,
+                      ns.workers)
+        print(f"\nAll done! Markdown synced: {md_path}")
+        return
+
+    fragments = playlists_to_markdown(_service_factory(creds), playlist_ids, ns.workers)
+
     with md_path.open("w", encoding="utf-8") as md_file:
-        for pid, src in zip(playlist_ids, raw_urls):
-            try:
-                md_file.write(playlist_to_markdown(youtube, pid))
+        for fragment, src in zip(fragments, raw_urls):
+            if isinstance(fragment, Exception):
+                print(f"✘ Failed {src}: {fragment}", file=sys.stderr)
+            else:
+                md_file.write(fragment)
                 print(f"✔ Added {src}")
-            except (HttpError, Exception) as exc:
-                print(f"✘ Failed {src}: {exc}", file=sys.stderr)
+    # the state described the file just overwritten: --incremental starts over from this export
+    Path(ns.state).expanduser().unlink(missing_ok=True)
 
     print(f"\nAll done! Markdown saved to: {md_path}")
 